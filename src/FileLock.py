@@ -0,0 +1,79 @@
+"""
+Advisory lock file shared by the server's worker processes.
+"""
+
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows, where the app runs as a single process
+    fcntl = None
+
+
+class FileLock:
+    """
+    Cross-process lock backed by `flock` on a file.
+
+    A multi-process server such as gunicorn imports app.py once in every
+    worker, and `multiprocessing.parent_process()` cannot tell those
+    workers apart. Start-up work that must happen once is therefore
+    coordinated through lock files. A lock held as a context manager
+    serializes work such as compiling the corpus: the first process does
+    it and the others find it done. A lock taken with `acquire(False)` and
+    never released picks one owner for the life of that process; the
+    operating system releases it when the owner exits, so a replacement
+    worker can take over.
+
+    Without `fcntl` every acquire succeeds.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initializes the lock; the file is created on first acquire.
+
+        Args:
+            path (str): The lock file.
+        """
+        self.path = path
+        self._file = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """
+        Takes the lock.
+
+        Args:
+            blocking (bool): Wait for the lock instead of failing. Defaults to True.
+
+        Returns:
+            bool: True if the lock is now held by this object.
+        """
+        if self._file is not None:
+            return True
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        lock_file = open(self.path, 'a')
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                lock_file.close()
+                return False
+        self._file = lock_file
+        return True
+
+    def release(self) -> None:
+        """
+        Releases the lock if it is held.
+        """
+        if self._file is not None:
+            # Closing the file drops the flock
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
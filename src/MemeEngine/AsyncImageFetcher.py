@@ -0,0 +1,119 @@
+"""
+Non-blocking counterpart of ImageFetcher for the asynchronous web app.
+"""
+
+import asyncio
+from typing import Optional
+
+import httpx
+
+from .ImageFetcher import FetchResult, ImageFetchError, ImageFetcher
+
+
+class AsyncImageFetcher:
+    """
+    Downloads remote images on the event loop with timeouts and a size cap.
+
+    It applies the same limits as `ImageFetcher` and returns the same
+    `FetchResult`, but it is built on a shared `httpx.AsyncClient`. A
+    download waiting on a slow server therefore holds a coroutine, not a
+    thread, and one process can keep thousands of them in flight. The
+    client is bound to the event loop it was first used on; call `aclose`
+    on shutdown.
+    """
+
+    def __init__(self, connect_timeout: float = 3.05, read_timeout: float = 10,
+                 total_timeout: float = 30, max_bytes: int = 10 * 1024 * 1024,
+                 max_connections: int = 1000, chunk_size: int = 64 * 1024):
+        """
+        Initializes the fetcher and its connection pool.
+
+        Args:
+            connect_timeout (float): Seconds to wait for a connection. Defaults to 3.05.
+            read_timeout (float): Seconds to wait between received bytes. Defaults to 10.
+            total_timeout (float): Seconds allowed for the whole download. Defaults to 30.
+            max_bytes (int): Largest accepted body. Defaults to 10 MiB.
+            max_connections (int): Concurrent connections across all hosts.
+                                   Defaults to 1000.
+            chunk_size (int): Bytes read per streamed chunk. Defaults to 64 KiB.
+        """
+        self.total_timeout = total_timeout
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=max_connections),
+            follow_redirects=True)
+
+    async def fetch(self, url: str) -> bytes:
+        """
+        Downloads the body of `url` into memory.
+
+        Raises:
+            ImageFetchError: On an invalid URL, HTTP or network error, timeout,
+                             or when the body exceeds `max_bytes`.
+        """
+        return (await self.fetch_conditional(url)).content
+
+    async def fetch_conditional(self, url: str, etag: Optional[str] = None,
+                                last_modified: Optional[str] = None) -> FetchResult:
+        """
+        Downloads `url`, revalidating a cached copy when validators are given.
+
+        See `ImageFetcher.fetch_conditional`.
+
+        Args:
+            url (str): An http(s) URL.
+            etag (str): ETag of the cached copy, if any.
+            last_modified (str): Last-Modified of the cached copy, if any.
+
+        Returns:
+            FetchResult: Status, body and caching headers.
+
+        Raises:
+            ImageFetchError: On an invalid URL, HTTP or network error, timeout,
+                             or when the body exceeds `max_bytes`.
+        """
+        if not url.startswith(('http://', 'https://')):
+            raise ImageFetchError(f"Only http(s) URLs are supported: {url}")
+
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        try:
+            return await asyncio.wait_for(self._download(url, headers), self.total_timeout)
+        except asyncio.TimeoutError:
+            raise ImageFetchError(f"Download of {url} took longer than {self.total_timeout}s")
+        except (httpx.HTTPError, httpx.InvalidURL) as e:
+            raise ImageFetchError(f"Error downloading image from {url}: {e}")
+
+    async def _download(self, url: str, headers: dict) -> FetchResult:
+        """
+        Streams the response body, enforcing the byte cap as it arrives.
+        """
+        async with self.client.stream('GET', url, headers=headers) as response:
+            if response.status_code == 304 and headers:
+                return ImageFetcher._result(response, None)
+            response.raise_for_status()
+
+            declared = response.headers.get('Content-Length')
+            if declared and declared.isdigit() and int(declared) > self.max_bytes:
+                raise ImageFetchError(
+                    f"Image at {url} is {declared} bytes; the limit is {self.max_bytes}")
+
+            body = bytearray()
+            async for chunk in response.aiter_bytes(self.chunk_size):
+                body.extend(chunk)
+                if len(body) > self.max_bytes:
+                    raise ImageFetchError(
+                        f"Image at {url} exceeds the {self.max_bytes} byte limit")
+            return ImageFetcher._result(response, bytes(body))
+
+    async def aclose(self) -> None:
+        """
+        Closes the pooled connections.
+        """
+        await self.client.aclose()
@@ -0,0 +1,103 @@
+"""
+Output encoders for rendered memes.
+"""
+
+from typing import BinaryIO, Optional, Union
+
+from PIL import Image
+
+# Per-format Pillow format name, file extension and MIME type
+FORMATS = {
+    'png': ('PNG', 'png', 'image/png'),
+    'jpeg': ('JPEG', 'jpg', 'image/jpeg'),
+    'webp': ('WEBP', 'webp', 'image/webp'),
+}
+
+# Accepted spellings for each format
+FORMAT_ALIASES = {'jpg': 'jpeg'}
+
+
+class Encoder:
+    """
+    Encodes rendered memes with a chosen format and quality settings.
+
+    `quality` applies to the lossy formats (JPEG and WebP) and
+    `compress_level` to PNG, where 0 is fastest and 9 is smallest.
+    """
+
+    def __init__(self, output_format: str = 'png', quality: int = 85,
+                 compress_level: int = 1):
+        """
+        Initializes the encoder.
+
+        Args:
+            output_format (str): One of 'png', 'jpeg' ('jpg') or 'webp'.
+                                 Defaults to 'png'.
+            quality (int): Quality for JPEG and WebP, 1-100. Defaults to 85.
+            compress_level (int): zlib level for PNG, 0-9. Defaults to 1,
+                                  which encodes much faster than Pillow's 6.
+
+        Raises:
+            ValueError: If the format is not supported.
+        """
+        output_format = output_format.lower()
+        output_format = FORMAT_ALIASES.get(output_format, output_format)
+        if output_format not in FORMATS:
+            raise ValueError(
+                f"Unsupported output format: {output_format}. "
+                f"Supported formats: {', '.join(sorted(FORMATS))}"
+            )
+        self.output_format = output_format
+        self.quality = quality
+        self.compress_level = compress_level
+
+    @property
+    def extension(self) -> str:
+        """ File extension for this format, without the dot. """
+        return FORMATS[self.output_format][1]
+
+    @property
+    def mimetype(self) -> str:
+        """ MIME type for this format. """
+        return FORMATS[self.output_format][2]
+
+    @property
+    def key(self) -> tuple:
+        """ The settings that affect the encoded bytes, for cache keys. """
+        if self.output_format == 'png':
+            return (self.output_format, self.compress_level)
+        return (self.output_format, self.quality)
+
+    def replace(self, output_format: Optional[str] = None, quality: Optional[int] = None,
+                compress_level: Optional[int] = None) -> 'Encoder':
+        """
+        Returns a copy of this encoder with some settings overridden.
+
+        Returns:
+            Encoder: The new encoder.
+        """
+        return Encoder(output_format or self.output_format,
+                       self.quality if quality is None else quality,
+                       self.compress_level if compress_level is None else compress_level)
+
+    def save(self, img: Image.Image, fp: Union[str, BinaryIO]) -> None:
+        """
+        Encodes an image to a path or a binary file object.
+
+        Args:
+            img (Image.Image): The image to encode.
+            fp (str or file): Destination path or writable binary stream.
+        """
+        pil_format = FORMATS[self.output_format][0]
+        if self.output_format == 'png':
+            img.save(fp, format=pil_format, compress_level=self.compress_level)
+        elif self.output_format == 'jpeg':
+            if img.mode not in ('RGB', 'L'):
+                img = img.convert('RGB')
+            img.save(fp, format=pil_format, quality=self.quality)
+        else:
+            img.save(fp, format=pil_format, quality=self.quality)
+
+    def __repr__(self) -> str:
+        return (f"Encoder({self.output_format!r}, quality={self.quality}, "
+                f"compress_level={self.compress_level})")
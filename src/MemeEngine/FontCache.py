@@ -0,0 +1,122 @@
+"""
+One-time font resolution and a size-keyed cache of font objects.
+"""
+
+import threading
+from typing import List, Optional, Tuple
+
+from PIL import ImageFont
+
+# Candidate font files, tried in order. Bare file names are looked up by
+# FreeType/Pillow in the platform font directories.
+DEFAULT_FONT_PATHS = [
+    'arial.ttf',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    '/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf',
+    '/usr/share/fonts/TTF/DejaVuSans.ttf',
+    '/Library/Fonts/Arial.ttf',
+    '/System/Library/Fonts/Supplemental/Arial.ttf',
+    'C:/Windows/Fonts/arial.ttf',
+]
+
+# Requested sizes are snapped down to one of these, which bounds the cache.
+SIZE_BUCKETS = (12, 14, 16, 20, 24, 28, 32, 40, 48, 56, 64, 80, 96)
+
+# Size used for positioning when only Pillow's fixed bitmap font is available
+BITMAP_FONT_SIZE = 15
+
+
+class FontCache:
+    """
+    Resolves a TrueType font once and caches font objects per size bucket.
+
+    Resolution happens at construction time, so rendering never touches the
+    filesystem or raises on a missing font. If no candidate can be loaded,
+    Pillow's built-in default font is used instead.
+    """
+
+    def __init__(self, font_paths: Optional[List[str]] = None):
+        """
+        Initializes the cache and resolves the font file to use.
+
+        Args:
+            font_paths (list): Font files to try in order. Defaults to
+                               `DEFAULT_FONT_PATHS`.
+        """
+        self.font_paths = list(font_paths) if font_paths else list(DEFAULT_FONT_PATHS)
+        self.font_path = self._resolve(self.font_paths)
+        self._fonts = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _resolve(font_paths: List[str]) -> Optional[str]:
+        """
+        Finds the first font file that FreeType can load.
+
+        Args:
+            font_paths (list): Candidate font files.
+
+        Returns:
+            str: The first loadable path, or None if none could be loaded.
+        """
+        for path in font_paths:
+            try:
+                ImageFont.truetype(path, SIZE_BUCKETS[0])
+                return path
+            except (IOError, OSError):
+                continue
+        print("Warning: No TrueType font found, falling back to Pillow's default font.")
+        return None
+
+    @staticmethod
+    def bucket(size: int) -> int:
+        """
+        Snaps a requested size down to the nearest size bucket.
+
+        Args:
+            size (int): The requested font size in pixels.
+
+        Returns:
+            int: The largest bucket not exceeding `size`, or the smallest bucket.
+        """
+        snapped = SIZE_BUCKETS[0]
+        for candidate in SIZE_BUCKETS:
+            if candidate > size:
+                break
+            snapped = candidate
+        return snapped
+
+    def _load(self, size: int) -> Tuple[ImageFont.ImageFont, int]:
+        """
+        Loads the resolved font at the given size.
+
+        Args:
+            size (int): A bucketed font size.
+
+        Returns:
+            tuple: The font object and the size to use for layout.
+        """
+        if self.font_path is not None:
+            return ImageFont.truetype(self.font_path, size), size
+        try:
+            # Pillow >= 10.1 ships a scalable default font when FreeType is present
+            return ImageFont.load_default(size=size), size
+        except TypeError:
+            return ImageFont.load_default(), BITMAP_FONT_SIZE
+
+    def get(self, size: int) -> Tuple[ImageFont.ImageFont, int]:
+        """
+        Returns a cached font for the size bucket nearest to `size`.
+
+        Args:
+            size (int): The requested font size in pixels.
+
+        Returns:
+            tuple: The font object and the effective font size.
+        """
+        size = self.bucket(size)
+        with self._lock:
+            cached = self._fonts.get(size)
+            if cached is None:
+                cached = self._fonts[size] = self._load(size)
+            return cached
@@ -0,0 +1,209 @@
+"""
+In-process cache of decoded and resized source images.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from PIL import Image
+
+from .ImagePyramid import ImagePyramid
+
+# Large sources are first shrunk cheaply (JPEG DCT scaling, Image.reduce) to
+# no less than this multiple of the target size, then resampled with LANCZOS.
+# At 2 the result differs from resampling the full image by well under one
+# level per channel on average.
+REDUCING_GAP = 2.0
+
+
+class ImageCache:
+    """
+    LRU cache holding resized base bitmaps for meme rendering.
+
+    Entries are keyed by (path, mtime, target width), so an edited file
+    is picked up on the next lookup. The cache is bounded by the total
+    number of bytes held by the cached bitmaps; the least recently used
+    entries are evicted once the budget is exceeded.
+
+    With an `ImagePyramid`, misses are decoded from the smallest
+    pre-generated level that is still at least as wide as the target.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024,
+                 pyramid: Optional[ImagePyramid] = None):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_bytes (int): Upper bound on the memory held by cached bitmaps.
+                             A value of 0 disables caching. Defaults to 64 MiB.
+            pyramid (ImagePyramid): Pre-generated downscaled copies of local
+                                    images to decode from. Optional.
+        """
+        self.max_bytes = max_bytes
+        self.pyramid = pyramid
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _image_bytes(img: Image.Image) -> int:
+        """
+        Estimates the memory footprint of a decoded image.
+
+        Args:
+            img (Image.Image): The decoded image.
+
+        Returns:
+            int: Approximate size of the pixel buffer in bytes.
+        """
+        return img.width * img.height * len(img.getbands())
+
+    @staticmethod
+    def load(img_path, width: int) -> Image.Image:
+        """
+        Decodes an image and downsamples it to at most `width` pixels wide.
+
+        JPEGs much wider than `width` are decoded in draft mode, which lets
+        the decoder scale by 1/2, 1/4 or 1/8 in the DCT domain. Neither the
+        time nor the memory of a full-resolution decode is spent.
+
+        Args:
+            img_path (str or file): The path to the image file, or a binary
+                                    file object such as a BytesIO.
+            width (int): The maximum width of the returned image.
+
+        Returns:
+            Image.Image: The fully loaded, resized image.
+        """
+        with Image.open(img_path) as img:
+            original_width, original_height = img.size
+            if original_width > width * REDUCING_GAP:
+                # No-op for formats without draft support
+                img.draft(None, (int(width * REDUCING_GAP),
+                                 int(width * REDUCING_GAP * original_height / original_width)))
+            return ImageCache.resize(img, width)
+
+    @staticmethod
+    def resize(img: Image.Image, width: int) -> Image.Image:
+        """
+        Downsamples an image to at most `width` pixels wide.
+
+        Much larger images are first reduced by an integer factor with
+        `Image.reduce`, which is far cheaper than LANCZOS over every
+        source pixel, and then resampled to the exact size.
+
+        Args:
+            img (Image.Image): The source image. It is not modified.
+            width (int): The maximum width of the returned image.
+
+        Returns:
+            Image.Image: A new, fully loaded image.
+        """
+        original_width, original_height = img.size
+        if original_width > width:
+            height = int(width * original_height / original_width)
+            return img.resize((width, height), Image.Resampling.LANCZOS,
+                              reducing_gap=REDUCING_GAP)
+        img.load()
+        return img.copy()
+
+    def get(self, img_path: str, width: int) -> Image.Image:
+        """
+        Returns a private copy of the resized base image for `img_path`.
+
+        The copy can be drawn on freely without affecting the cached bitmap.
+
+        Args:
+            img_path (str): The path to the image file.
+            width (int): The maximum width of the image.
+
+        Returns:
+            Image.Image: A copy of the resized image.
+
+        Raises:
+            FileNotFoundError: If the image file does not exist.
+        """
+        key = (os.path.abspath(img_path), os.stat(img_path).st_mtime_ns, width)
+
+        with self._lock:
+            img = self._entries.get(key)
+            if img is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return img.copy()
+            self.misses += 1
+
+        source = self.pyramid.source_for(img_path, width) if self.pyramid else img_path
+        img = self.load(source, width)
+        self._put(key, img)
+        return img.copy()
+
+    def _put(self, key: Tuple[str, int, int], img: Image.Image) -> None:
+        """
+        Stores a bitmap and evicts least recently used entries over budget.
+
+        Args:
+            key (tuple): The (path, mtime, width) cache key.
+            img (Image.Image): The resized image to cache.
+        """
+        size = self._image_bytes(img)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = img
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= self._image_bytes(evicted)
+                self.evictions += 1
+
+    def evict(self, img_path: str) -> int:
+        """
+        Drops every cached bitmap of one source file, at any mtime or width.
+
+        Args:
+            img_path (str): The path to the image file.
+
+        Returns:
+            int: The number of entries dropped.
+        """
+        path = os.path.abspath(img_path)
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == path]
+            for key in keys:
+                self.current_bytes -= self._image_bytes(self._entries.pop(key))
+            return len(keys)
+
+    def clear(self) -> None:
+        """
+        Drops every cached bitmap. Counters are left untouched.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Reports cache counters, useful for sizing the byte budget.
+
+        Returns:
+            dict: Hits, misses, evictions, entry count and bytes in use.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+            }
@@ -0,0 +1,152 @@
+"""
+Bounded, pooled download of remote images into memory.
+"""
+
+import re
+import time
+from typing import NamedTuple, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class ImageFetchError(Exception):
+    """
+    Raised when a remote image cannot be downloaded within the limits.
+    """
+
+
+class FetchResult(NamedTuple):
+    """
+    Outcome of a (possibly conditional) fetch.
+    """
+    status: int                   # HTTP status, 200 or 304
+    content: Optional[bytes]      # The body, or None for 304 Not Modified
+    etag: Optional[str]           # ETag response header
+    last_modified: Optional[str]  # Last-Modified response header
+    max_age: Optional[int]        # Cache-Control max-age in seconds, if given
+    no_store: bool = False        # Cache-Control no-store: the body must not be kept
+
+
+class ImageFetcher:
+    """
+    Downloads remote images with timeouts and a size cap.
+
+    A single `requests.Session` is shared by every fetch, so connections to
+    popular hosts are pooled and reused. Bodies are streamed into memory
+    and the byte cap is enforced while streaming, so an oversized or
+    endless response is cut off early instead of being buffered or
+    written to disk.
+    """
+
+    def __init__(self, connect_timeout: float = 3.05, read_timeout: float = 10,
+                 total_timeout: float = 30, max_bytes: int = 10 * 1024 * 1024,
+                 pool_size: int = 16, chunk_size: int = 64 * 1024):
+        """
+        Initializes the fetcher and its connection pool.
+
+        Args:
+            connect_timeout (float): Seconds to wait for a connection. Defaults to 3.05.
+            read_timeout (float): Seconds to wait between received bytes. Defaults to 10.
+            total_timeout (float): Seconds allowed for the whole download, so a
+                                   server dripping bytes cannot hold a worker
+                                   indefinitely. Defaults to 30.
+            max_bytes (int): Largest accepted body. Defaults to 10 MiB.
+            pool_size (int): Connections kept per host. Defaults to 16.
+            chunk_size (int): Bytes read per streamed chunk. Defaults to 64 KiB.
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.total_timeout = total_timeout
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def fetch(self, url: str) -> bytes:
+        """
+        Downloads the body of `url` into memory.
+
+        Args:
+            url (str): An http(s) URL.
+
+        Returns:
+            bytes: The response body.
+
+        Raises:
+            ImageFetchError: On an invalid URL, HTTP or network error, timeout,
+                             or when the body exceeds `max_bytes`.
+        """
+        return self.fetch_conditional(url).content
+
+    def fetch_conditional(self, url: str, etag: Optional[str] = None,
+                          last_modified: Optional[str] = None) -> FetchResult:
+        """
+        Downloads `url`, revalidating a cached copy when validators are given.
+
+        With `etag` or `last_modified`, the request carries If-None-Match /
+        If-Modified-Since and a 304 response is returned without a body.
+
+        Args:
+            url (str): An http(s) URL.
+            etag (str): ETag of the cached copy, if any.
+            last_modified (str): Last-Modified of the cached copy, if any.
+
+        Returns:
+            FetchResult: Status, body and caching headers.
+
+        Raises:
+            ImageFetchError: On an invalid URL, HTTP or network error, timeout,
+                             or when the body exceeds `max_bytes`.
+        """
+        if not url.startswith(('http://', 'https://')):
+            raise ImageFetchError(f"Only http(s) URLs are supported: {url}")
+
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        deadline = time.monotonic() + self.total_timeout
+        try:
+            with self.session.get(url, stream=True, headers=headers,
+                                  timeout=(self.connect_timeout, self.read_timeout)) as response:
+                if response.status_code == 304 and headers:
+                    return self._result(response, None)
+                response.raise_for_status()
+
+                declared = response.headers.get('Content-Length')
+                if declared and declared.isdigit() and int(declared) > self.max_bytes:
+                    raise ImageFetchError(
+                        f"Image at {url} is {declared} bytes; the limit is {self.max_bytes}")
+
+                body = bytearray()
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    body.extend(chunk)
+                    if len(body) > self.max_bytes:
+                        raise ImageFetchError(
+                            f"Image at {url} exceeds the {self.max_bytes} byte limit")
+                    if time.monotonic() > deadline:
+                        raise ImageFetchError(
+                            f"Download of {url} took longer than {self.total_timeout}s")
+                return self._result(response, bytes(body))
+        except requests.exceptions.RequestException as e:
+            raise ImageFetchError(f"Error downloading image from {url}: {e}")
+
+    @staticmethod
+    def _result(response: requests.Response, content: Optional[bytes]) -> FetchResult:
+        """
+        Packs a response and its body into a FetchResult.
+        """
+        cache_control = response.headers.get('Cache-Control', '')
+        match = re.search(r'max-age=(\d+)', cache_control)
+        if 'no-store' in cache_control or 'no-cache' in cache_control:
+            max_age = 0
+        else:
+            max_age = int(match.group(1)) if match else None
+        return FetchResult(response.status_code, content, response.headers.get('ETag'),
+                           response.headers.get('Last-Modified'), max_age,
+                           'no-store' in cache_control)
@@ -0,0 +1,178 @@
+"""
+Pre-generated size pyramid for the local photo library.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Iterable, List
+
+from PIL import Image
+
+
+class ImagePyramid:
+    """
+    Stores downscaled copies of source images at halving widths.
+
+    For a 4000px photo the levels are 2000, 1000, 500 and 250px wide
+    (down to `min_width`). `source_for` returns the smallest level that is
+    still at least as wide as the requested width, so rendering a 500px
+    meme decodes a 500px file instead of the original. Levels are written
+    under `cache_dir` and listed in an index keyed by each source's path,
+    size and mtime. An edited source is therefore never served from stale
+    levels and is picked up again by the next `build`.
+    """
+
+    def __init__(self, cache_dir: str = './_cache/pyramid', min_width: int = 250):
+        """
+        Initializes the pyramid and loads its index.
+
+        Args:
+            cache_dir (str): Directory holding the levels. Defaults to './_cache/pyramid'.
+            min_width (int): No level narrower than this is generated. Defaults to 250.
+        """
+        self.cache_dir = cache_dir
+        self.min_width = min_width
+        self._index_path = os.path.join(cache_dir, 'index.json')
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = {}
+        self.reload()
+
+    def reload(self) -> None:
+        """
+        Re-reads the index, e.g. after another process built levels.
+        """
+        try:
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        with self._lock:
+            self._index = index
+
+    @staticmethod
+    def _fingerprint(img_path: str) -> list:
+        """
+        Returns the [size, mtime] of a source file.
+        """
+        stat = os.stat(img_path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _level_path(self, img_path: str, fingerprint: list, width: int, extension: str) -> str:
+        """
+        Returns the file path of one level.
+        """
+        key = hashlib.sha1(f"{os.path.abspath(img_path)}\0{fingerprint}".encode('utf-8'))
+        return os.path.join(self.cache_dir, f"{key.hexdigest()[:20]}_{width}{extension}")
+
+    def _generate(self, img_path: str, fingerprint: list) -> List[list]:
+        """
+        Writes the levels of one source image.
+
+        Returns:
+            list: [width, path] pairs, widest first.
+        """
+        # Imported here to avoid a circular import; ImageCache uses the pyramid
+        from .ImageCache import ImageCache
+
+        levels = []
+        with Image.open(img_path) as img:
+            is_jpeg = img.format == 'JPEG'
+            width = img.width // 2
+            while width >= self.min_width:
+                level = ImageCache.load(img_path, width)
+                if is_jpeg and level.mode in ('RGB', 'L'):
+                    path = self._level_path(img_path, fingerprint, width, '.jpg')
+                    level.save(path, 'JPEG', quality=95, subsampling=0)
+                else:
+                    path = self._level_path(img_path, fingerprint, width, '.png')
+                    level.save(path, 'PNG', compress_level=1)
+                levels.append([width, path])
+                width //= 2
+        return levels
+
+    def build(self, img_paths: Iterable[str]) -> int:
+        """
+        Generates missing or outdated levels for the given images.
+
+        Images smaller than twice `min_width` get no levels. Failures are
+        reported and skipped. The index is re-read first, so levels that
+        another process already built are picked up rather than rebuilt;
+        processes sharing `cache_dir` should not build at the same time.
+
+        Args:
+            img_paths (iterable): Local source images.
+
+        Returns:
+            int: The number of images whose levels were (re)generated.
+        """
+        self.reload()
+        built = 0
+        for img_path in img_paths:
+            path = os.path.abspath(img_path)
+            try:
+                fingerprint = self._fingerprint(img_path)
+                entry = self._index.get(path)
+                if entry is not None and entry['fingerprint'] == fingerprint:
+                    continue
+                levels = self._generate(img_path, fingerprint)
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not build image pyramid for {img_path}: {e}")
+                continue
+
+            with self._lock:
+                old = self._index.get(path)
+                self._index[path] = {'fingerprint': fingerprint, 'levels': levels}
+            if old is not None:
+                for _, level_path in old['levels']:
+                    if level_path not in {p for _, p in levels}:
+                        try:
+                            os.remove(level_path)
+                        except FileNotFoundError:
+                            pass
+            built += 1
+
+        if built:
+            self._save_index()
+        return built
+
+    def _save_index(self) -> None:
+        """
+        Atomically replaces the index file.
+        """
+        with self._lock:
+            data = json.dumps(self._index).encode('utf-8')
+        temp_path = f"{self._index_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, self._index_path)
+
+    def source_for(self, img_path: str, width: int) -> str:
+        """
+        Picks the file to decode for a render at `width`.
+
+        Args:
+            img_path (str): The source image.
+            width (int): The target width.
+
+        Returns:
+            str: The smallest up-to-date level at least `width` wide, or
+                 `img_path` itself if there is none.
+        """
+        with self._lock:
+            entry = self._index.get(os.path.abspath(img_path))
+        if entry is None:
+            return img_path
+        try:
+            if entry['fingerprint'] != self._fingerprint(img_path):
+                return img_path
+        except OSError:
+            return img_path
+
+        best = None
+        for level_width, level_path in entry['levels']:
+            if level_width >= width and os.path.exists(level_path):
+                best = level_path
+        return best or img_path
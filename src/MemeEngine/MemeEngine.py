@@ -0,0 +1,332 @@
+import hashlib
+import io
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Iterator, NamedTuple, Optional, Union
+from PIL import Image
+from .Encoder import Encoder
+from .FontCache import FontCache
+from .ImageCache import ImageCache
+from .ImagePyramid import ImagePyramid
+from .TextLayout import TextLayout
+
+# Part of every output name; bump it whenever rendering changes so memes
+# cached under the old layout are not served again.
+RENDER_VERSION = 3
+
+# Engine owned by each batch worker process, created once by `_init_worker`
+# so decoded images and fonts are reused across that worker's jobs.
+_worker_engine = None
+
+
+class MemeJobResult(NamedTuple):
+    """
+    Outcome of one job submitted to `MemeEngine.make_memes`.
+    """
+    index: int            # Position of the job in the submitted sequence
+    job: tuple            # The (img_path, text, author[, width]) job itself
+    path: Optional[str]   # Path to the meme, or None if the job failed
+    error: Optional[str]  # Error message, or None on success
+
+
+def _init_worker(config: dict) -> None:
+    """
+    Creates the MemeEngine used by `_render_job` in a worker process.
+
+    Args:
+        config (dict): Keyword arguments to construct the engine with.
+    """
+    global _worker_engine
+    _worker_engine = MemeEngine(**config)
+
+
+def _render_job(index: int, job: tuple) -> MemeJobResult:
+    """
+    Renders one batch job, capturing any error instead of raising it.
+
+    Args:
+        index (int): Position of the job in the batch.
+        job (tuple): (img_path, text, author) or (img_path, text, author, width).
+
+    Returns:
+        MemeJobResult: The rendered path or the error message.
+    """
+    try:
+        return MemeJobResult(index, job, _worker_engine.make_meme(*job), None)
+    except Exception as e:
+        return MemeJobResult(index, job, None, str(e))
+
+
+class MemeEngine:
+    """
+    A class to create memes by manipulating and drawing text onto images.
+
+    This engine handles loading, resizing, adding text, and saving images.
+    """
+
+    def __init__(self, output_dir='./tmp', image_cache_bytes: int = 64 * 1024 * 1024,
+                 font_paths=None, encoder: Optional[Encoder] = None,
+                 pyramid_dir: Optional[str] = None):
+        """
+        Initializes the MemeEngine with an output directory for generated memes.
+
+        Args:
+            output_dir (str): The directory where the manipulated images will be saved.
+                              Defaults to './tmp'.
+            image_cache_bytes (int): Memory budget for decoded and resized source
+                                     images. 0 disables the cache. Defaults to 64 MiB.
+            font_paths (list): Font files to try, in order. The first loadable
+                               one is used for every meme. Defaults to a list of
+                               common Windows, macOS and Linux fonts.
+            encoder (Encoder): Default output format and quality settings.
+                               Defaults to PNG with fast compression.
+            pyramid_dir (str): Directory of an `ImagePyramid` to decode local
+                               images from. Levels are generated with
+                               `self.image_cache.pyramid.build`. Optional.
+        """
+        self.output_dir = output_dir
+        # Constructor arguments, used to build identical engines in workers
+        self.config = {'output_dir': output_dir,
+                       'image_cache_bytes': image_cache_bytes,
+                       'font_paths': font_paths,
+                       'encoder': encoder,
+                       'pyramid_dir': pyramid_dir}
+        self.image_cache = ImageCache(image_cache_bytes,
+                                      ImagePyramid(pyramid_dir) if pyramid_dir else None)
+        self.fonts = FontCache(font_paths)
+        self.text_layout = TextLayout(self.fonts)
+        self.encoder = encoder if encoder is not None else Encoder()
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+    @staticmethod
+    def _source_identity(img_path: Union[str, bytes, Image.Image]) -> tuple:
+        """
+        Identifies a source image for content addressing.
+
+        Args:
+            img_path (str, bytes or Image.Image): A file path, the encoded
+                                                  image, or a decoded image.
+
+        Returns:
+            tuple: (path, size, mtime) for files, or a digest of the bytes
+                   or pixels.
+
+        Raises:
+            FileNotFoundError: If the specified image file does not exist.
+        """
+        if isinstance(img_path, bytes):
+            return ('sha1', hashlib.sha1(img_path).hexdigest())
+        if isinstance(img_path, Image.Image):
+            return ('pixels', img_path.mode, img_path.size,
+                    hashlib.sha1(img_path.tobytes()).hexdigest())
+        stat = os.stat(img_path)
+        return (os.path.abspath(img_path), stat.st_size, stat.st_mtime_ns)
+
+    def _load_base(self, img_path: Union[str, bytes, Image.Image], width: int) -> Image.Image:
+        """
+        Returns a resized base image that is safe to draw on.
+
+        Files go through the image cache; encoded bytes, e.g. a downloaded
+        image, are decoded straight from memory; decoded images, e.g. from
+        the remote image cache, are resized if needed and copied.
+
+        Args:
+            img_path (str, bytes or Image.Image): A file path, the encoded
+                                                  image, or a decoded image.
+            width (int): The maximum width of the image.
+
+        Returns:
+            Image.Image: The resized image.
+        """
+        if isinstance(img_path, bytes):
+            return ImageCache.load(io.BytesIO(img_path), width)
+        if isinstance(img_path, Image.Image):
+            return ImageCache.resize(img_path, width)
+        return self.image_cache.get(img_path, width)
+
+    def output_name(self, img_path: Union[str, bytes, Image.Image], text: str, author: str, width: int = 500,
+                    encoder: Optional[Encoder] = None) -> str:
+        """
+        Derives a content-addressed file name for a meme.
+
+        The name is a hash of everything that affects the rendered pixels:
+        the source image identity (path, size and mtime, or a digest of
+        in-memory image bytes or pixels), the quote, the
+        width, the font, the encoder settings, whether local images are
+        decoded from a pyramid level (which can differ slightly from a full
+        decode) and the render version. Identical requests therefore map to
+        the same file.
+
+        Args:
+            img_path (str, bytes or Image.Image): The path to the input image
+                                                  file, the encoded image, or
+                                                  a decoded image.
+            text (str): The quote body.
+            author (str): The quote author.
+            width (int): The maximum width of the output image.
+            encoder (Encoder): Output settings. Defaults to the engine's encoder.
+
+        Returns:
+            str: A file name of the form 'meme_<hash>.<extension>'.
+
+        Raises:
+            FileNotFoundError: If the specified image file does not exist.
+        """
+        encoder = encoder or self.encoder
+        digest = hashlib.sha1()
+        uses_pyramid = isinstance(img_path, str) and self.image_cache.pyramid is not None
+        for part in (RENDER_VERSION, self._source_identity(img_path), text, author,
+                     width, self.fonts.font_path, encoder.key, uses_pyramid):
+            digest.update(str(part).encode('utf-8'))
+            digest.update(b'\0')
+        return f"meme_{digest.hexdigest()[:20]}.{encoder.extension}"
+
+    def _draw_caption(self, img: Image.Image, text: str, author: str) -> Image.Image:
+        """
+        Draws the quote body and author onto the bottom of an image.
+
+        The caption is wrapped and sized by the engine's `TextLayout`, and
+        its cached overlay is composited onto the image in place.
+
+        Args:
+            img (Image.Image): The resized base image to draw on.
+            text (str): The quote body.
+            author (str): The quote author.
+
+        Returns:
+            Image.Image: The captioned image; a converted copy if `img` was
+                         neither RGB nor RGBA.
+        """
+        return self.text_layout.draw(img, text, author)
+
+    def make_meme(self, img_path: Union[str, bytes, Image.Image], text: str, author: str, width: int = 500,
+                  as_bytes: bool = False, encoder: Optional[Encoder] = None):
+        """
+        Creates a meme by adding text and author to an image and resizing it.
+
+        Output files are content-addressed (see `output_name`). If the meme
+        for these inputs already exists it is returned without rendering.
+        With `as_bytes`, nothing is written to disk and the encoded image is
+        returned instead. The output format and quality come from `encoder`,
+        or from the engine's default encoder.
+
+        Args:
+            img_path (str, bytes or Image.Image): The path to the input image
+                                                  file, the encoded image (e.g. a
+                                                  download), or a decoded image.
+            text (str): The quote body to be added to the image.
+            author (str): The author of the quote to be added to the image.
+            width (int): The maximum width of the output image. The height
+                         will be scaled proportionally. Defaults to 500px.
+            as_bytes (bool): Return the encoded image instead of a file path.
+            encoder (Encoder): Output settings for this call only.
+
+        Returns:
+            str: The path to the meme image, or
+            bytes: The encoded meme when `as_bytes` is True.
+
+        Raises:
+            FileNotFoundError: If the specified image file does not exist.
+            IOError: If there is an error loading or saving the image.
+            Exception: For other unexpected errors during meme generation.
+        """
+        encoder = encoder or self.encoder
+        try:
+            if not as_bytes:
+                output_path = os.path.join(self.output_dir,
+                                           self.output_name(img_path, text, author, width, encoder))
+                if os.path.exists(output_path):
+                    return output_path
+
+            # Decoding and resizing is served from the cache; we draw on a copy
+            img = self._load_base(img_path, width)
+            with img:
+                img = self._draw_caption(img, text, author)
+
+                if as_bytes:
+                    buffer = io.BytesIO()
+                    encoder.save(img, buffer)
+                    return buffer.getvalue()
+
+                # Save to a private temporary name first so concurrent requests
+                # never see a partially written file under the final name
+                temp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                encoder.save(img, temp_path)
+                os.replace(temp_path, output_path)
+                return output_path
+
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Image file not found at: {img_path}")
+        except IOError as e:
+            raise IOError(f"Error loading or saving image: {e}")
+        except Exception as e:
+            raise Exception(f"An unexpected error occurred: {e}")
+
+    def worker_pool(self, workers: Optional[int] = None) -> ProcessPoolExecutor:
+        """
+        Starts a process pool of render workers for `make_memes`.
+
+        The worker processes exist when this returns. With the fork start
+        method, create the pool before the process starts any threads:
+        a child forked while other threads hold locks can deadlock.
+
+        Args:
+            workers (int): Number of worker processes. Defaults to the CPU count.
+
+        Returns:
+            ProcessPoolExecutor: The pool; the caller shuts it down.
+        """
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(self.config,))
+        # The first submission starts the workers; with fork, all of them
+        # are started before the executor's own management thread
+        executor.submit(os.getpid).result()
+        return executor
+
+    def make_memes(self, jobs: Iterable[tuple], workers: Optional[int] = None,
+                   executor: Optional[ProcessPoolExecutor] = None) -> Iterator[MemeJobResult]:
+        """
+        Renders a batch of memes across a process pool.
+
+        Each worker process builds one engine with this engine's settings,
+        so its image and font caches are reused for every job it runs.
+        Results are yielded as soon as each job finishes, which is not
+        necessarily submission order; use `MemeJobResult.index` to match
+        them up. A failing job yields a result with `error` set and does
+        not stop the batch.
+
+        Args:
+            jobs (iterable): Tuples of (img_path, text, author) or
+                             (img_path, text, author, width).
+            workers (int): Number of worker processes. Defaults to the CPU
+                           count. With 1, jobs run in this process.
+            executor (ProcessPoolExecutor): A pool from `worker_pool` to run
+                                            the jobs on. It is left running.
+                                            Defaults to a new pool for this
+                                            batch.
+
+        Yields:
+            MemeJobResult: One result per job.
+        """
+        if workers == 1 and executor is None:
+            for index, job in enumerate(jobs):
+                try:
+                    yield MemeJobResult(index, job, self.make_meme(*job), None)
+                except Exception as e:
+                    yield MemeJobResult(index, job, None, str(e))
+            return
+
+        owned = executor is None
+        if owned:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                           initargs=(self.config,))
+        try:
+            futures = [executor.submit(_render_job, index, tuple(job))
+                       for index, job in enumerate(jobs)]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            if owned:
+                executor.shutdown()
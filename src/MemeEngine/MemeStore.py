@@ -0,0 +1,93 @@
+"""
+Bounded in-memory store for encoded memes served straight from RAM.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class MemeStore:
+    """
+    Holds encoded memes under short-lived IDs.
+
+    The store is bounded both by the number of entries and by their total
+    size; the oldest entries are dropped first. The newest entry is always
+    kept, even when it alone is larger than `max_bytes`, so a meme that was
+    just stored can be fetched. Entries also expire after `ttl` seconds,
+    which is how long a rendered page may take to fetch its image.
+    """
+
+    def __init__(self, max_items: int = 256, max_bytes: int = 32 * 1024 * 1024,
+                 ttl: float = 300):
+        """
+        Initializes an empty store.
+
+        Args:
+            max_items (int): Maximum number of memes held. Defaults to 256.
+            max_bytes (int): Maximum total size of held memes. Defaults to 32 MiB.
+            ttl (float): Seconds an entry stays retrievable. Defaults to 300.
+        """
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        """
+        Drops expired entries and entries over the size budget, oldest first.
+
+        Must be called with the lock held.
+        """
+        while self._entries:
+            _, (data, _, expires) = next(iter(self._entries.items()))
+            # The budget never evicts the last (newest) entry
+            over_budget = len(self._entries) > 1 and (
+                len(self._entries) > self.max_items or self.current_bytes > self.max_bytes)
+            if expires > now and not over_budget:
+                break
+            self._entries.popitem(last=False)
+            self.current_bytes -= len(data)
+
+    def put(self, meme_id: str, data: bytes, mimetype: str) -> None:
+        """
+        Stores an encoded meme, replacing any entry with the same ID.
+
+        Args:
+            meme_id (str): The ID to serve the meme under.
+            data (bytes): The encoded image.
+            mimetype (str): The image MIME type, e.g. 'image/png'.
+        """
+        now = time.monotonic()
+        with self._lock:
+            previous = self._entries.pop(meme_id, None)
+            if previous is not None:
+                self.current_bytes -= len(previous[0])
+            self._entries[meme_id] = (data, mimetype, now + self.ttl)
+            self.current_bytes += len(data)
+            self._expire(now)
+
+    def get(self, meme_id: str) -> Optional[Tuple[bytes, str]]:
+        """
+        Looks up a stored meme.
+
+        Args:
+            meme_id (str): The ID the meme was stored under.
+
+        Returns:
+            tuple: (data, mimetype), or None if unknown or expired.
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            entry = self._entries.get(meme_id)
+            return entry[:2] if entry else None
+
+    def __contains__(self, meme_id: str) -> bool:
+        return self.get(meme_id) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
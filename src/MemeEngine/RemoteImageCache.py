@@ -0,0 +1,289 @@
+"""
+On-disk cache of remote images, stored as decoded and resized bitmaps.
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from PIL import Image
+
+from .ImageCache import ImageCache
+from .ImageFetcher import ImageFetcher
+
+
+class RemoteImageCache:
+    """
+    Caches fetched images by (URL, width) in a directory on disk.
+
+    Each entry is the resized base bitmap as raw pixels plus a small JSON
+    sidecar with the HTTP validators, so a hit needs neither a network
+    round trip nor an image decode. Entries are fresh for the response's
+    Cache-Control max-age (or `max_age` when the server sends none);
+    stale entries are revalidated with If-None-Match / If-Modified-Since.
+    Responses sent with no-store are used once and never written.
+    The directory is bounded by total size, evicting the least recently
+    used entries first.
+    """
+
+    def __init__(self, fetcher: Optional[ImageFetcher] = None,
+                 cache_dir: str = './_cache/remote', max_bytes: int = 256 * 1024 * 1024,
+                 max_age: int = 300):
+        """
+        Initializes the cache and creates its directory.
+
+        Args:
+            fetcher (ImageFetcher): Used for downloads and revalidation.
+            cache_dir (str): Directory holding the entries. Defaults to './_cache/remote'.
+            max_bytes (int): Upper bound on the size of stored bitmaps. Defaults to 256 MiB.
+            max_age (int): Freshness lifetime in seconds when the server gives
+                           none. Defaults to 300.
+        """
+        self.fetcher = fetcher if fetcher is not None else ImageFetcher()
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url: str, width: int):
+        """
+        Returns the (bitmap, metadata) file paths for an entry.
+        """
+        key = hashlib.sha1(f"{url}\0{width}".encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + '.raw', base + '.json'
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        """
+        Writes a file under a temporary name and renames it into place.
+        """
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def _read(self, raw_path: str, meta_path: str):
+        """
+        Loads an entry from disk.
+
+        Returns:
+            tuple: (metadata dict, image), or (None, None) if missing or corrupt.
+        """
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(raw_path, 'rb') as f:
+                img = Image.frombytes(meta['mode'], tuple(meta['size']), f.read())
+            return meta, img
+        except (OSError, ValueError, KeyError):
+            return None, None
+
+    def _store(self, raw_path: str, meta_path: str, meta: dict, img: Image.Image) -> None:
+        """
+        Writes an entry to disk and enforces the size budget.
+        """
+        meta.update({'mode': img.mode, 'size': list(img.size)})
+        self._write_atomic(raw_path, img.tobytes())
+        self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+        self._evict()
+
+    def _evict(self) -> None:
+        """
+        Deletes least recently used entries until the cache fits its budget.
+
+        Access time is tracked through the bitmap's mtime, which is bumped
+        on every hit.
+        """
+        with self._lock:
+            entries = []
+            total = 0
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith('.raw'):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                for victim in (path, path[:-len('.raw')] + '.json'):
+                    try:
+                        os.remove(victim)
+                    except FileNotFoundError:
+                        pass
+                total -= size
+
+    @staticmethod
+    def _decode(data: bytes, width: int) -> Image.Image:
+        """
+        Decodes downloaded bytes into a resized bitmap that can be stored raw.
+        """
+        img = ImageCache.load(io.BytesIO(data), width)
+        if img.mode not in ('RGB', 'RGBA', 'L'):
+            has_alpha = 'A' in img.getbands() or 'transparency' in img.info
+            img = img.convert('RGBA' if has_alpha else 'RGB')
+        return img
+
+    def _lookup(self, url: str, width: int):
+        """
+        Finds the stored entry for (url, width).
+
+        Returns:
+            tuple: (bitmap path, metadata path, metadata, image); metadata and
+                   image are None if there is no usable entry.
+        """
+        raw_path, meta_path = self._paths(url, width)
+        meta, img = self._read(raw_path, meta_path)
+        if meta is None or meta.get('url') != url:
+            return raw_path, meta_path, None, None
+        return raw_path, meta_path, meta, img
+
+    def _hit(self, raw_path: str, meta: dict, now: float) -> bool:
+        """
+        Counts and records a hit if the entry is still fresh.
+
+        Returns:
+            bool: True if the stored image can be served as is.
+        """
+        if meta is None or now >= meta['expires']:
+            return False
+        self.hits += 1
+        os.utime(raw_path)
+        return True
+
+    def _revalidate(self, raw_path: str, meta_path: str, meta: dict, result,
+                    now: float) -> None:
+        """
+        Extends the expiry of a stored entry after a 304.
+        """
+        self.revalidated += 1
+        meta['expires'] = now + (result.max_age if result.max_age is not None else self.max_age)
+        self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+        os.utime(raw_path)
+
+    def _save(self, url: str, raw_path: str, meta_path: str, result, img: Image.Image,
+              now: float) -> None:
+        """
+        Stores a freshly downloaded and decoded image, unless the server
+        sent Cache-Control: no-store.
+        """
+        self.misses += 1
+        if result.no_store:
+            return
+        max_age = result.max_age if result.max_age is not None else self.max_age
+        self._store(raw_path, meta_path, {
+            'url': url,
+            'etag': result.etag,
+            'last_modified': result.last_modified,
+            'expires': now + max_age,
+        }, img)
+
+    def get(self, url: str, width: int = 500, run: Optional[Callable] = None) -> Image.Image:
+        """
+        Returns the resized base bitmap for a remote image.
+
+        Args:
+            url (str): The image URL.
+            width (int): The maximum width of the image. Defaults to 500.
+            run (callable): Runs the decode and resize of a downloaded image,
+                            as `run(fn, *args)`. Pass `RenderScheduler.run`
+                            so this work is bounded by the render pool.
+                            Defaults to running it in the calling thread.
+
+        Returns:
+            Image.Image: The resized image, safe to draw on.
+
+        Raises:
+            ImageFetchError: If the image has to be downloaded and that fails.
+            SchedulerBusy: If `run` is a scheduler's and it is overloaded.
+        """
+        raw_path, meta_path, meta, img = self._lookup(url, width)
+        now = time.time()
+        if self._hit(raw_path, meta, now):
+            return img
+
+        if meta is not None:
+            result = self.fetcher.fetch_conditional(url, meta.get('etag'),
+                                                    meta.get('last_modified'))
+        else:
+            result = self.fetcher.fetch_conditional(url)
+        if result.status == 304 and meta is not None:
+            self._revalidate(raw_path, meta_path, meta, result, now)
+            return img
+
+        if run is not None:
+            img = run(self._decode, result.content, width)
+        else:
+            img = self._decode(result.content, width)
+        self._save(url, raw_path, meta_path, result, img, now)
+        return img
+
+    async def get_async(self, url: str, fetcher, width: int = 500,
+                        run: Optional[Callable] = None) -> Image.Image:
+        """
+        Asynchronous `get`, downloading with an `AsyncImageFetcher`.
+
+        Disk access runs on the default executor, so the event loop is
+        only held while waiting for the network.
+
+        Args:
+            url (str): The image URL.
+            fetcher (AsyncImageFetcher): Used for downloads and revalidation.
+            width (int): The maximum width of the image. Defaults to 500.
+            run (callable): Coroutine function that runs the decode and resize
+                            of a downloaded image, as `await run(fn, *args)`,
+                            e.g. on the render pool. Defaults to the default
+                            executor.
+
+        Returns:
+            Image.Image: The resized image, safe to draw on.
+
+        Raises:
+            ImageFetchError: If the image has to be downloaded and that fails.
+        """
+        loop = asyncio.get_running_loop()
+        raw_path, meta_path, meta, img = await loop.run_in_executor(None, self._lookup, url, width)
+        now = time.time()
+        if await loop.run_in_executor(None, self._hit, raw_path, meta, now):
+            return img
+
+        if meta is not None:
+            result = await fetcher.fetch_conditional(url, meta.get('etag'),
+                                                     meta.get('last_modified'))
+        else:
+            result = await fetcher.fetch_conditional(url)
+        if result.status == 304 and meta is not None:
+            await loop.run_in_executor(None, self._revalidate, raw_path, meta_path, meta,
+                                       result, now)
+            return img
+
+        if run is not None:
+            img = await run(self._decode, result.content, width)
+        else:
+            img = await loop.run_in_executor(None, self._decode, result.content, width)
+        await loop.run_in_executor(None, self._save, url, raw_path, meta_path, result, img, now)
+        return img
+
+    def stats(self) -> dict:
+        """
+        Reports hit, revalidation and miss counters.
+
+        Returns:
+            dict: The counters.
+        """
+        return {'hits': self.hits, 'revalidated': self.revalidated, 'misses': self.misses}
@@ -0,0 +1,225 @@
+"""
+Bounded render queue between the web routes and MemeEngine.
+"""
+
+import math
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, wait
+from typing import Callable, Optional
+
+
+class SchedulerBusy(Exception):
+    """
+    Raised when the render queue is full, or a render missed its deadline.
+
+    `retry_after` is the suggested wait in whole seconds before retrying.
+    """
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RenderScheduler:
+    """
+    Runs renders on a fixed pool of threads fed by a bounded queue.
+
+    Request threads hand their render to `run` and wait for the result,
+    so at most `workers` renders run at once no matter how many requests
+    arrive. When `max_queue` renders are already waiting, `run` fails
+    immediately with `SchedulerBusy` instead of queueing more work. Each
+    render also has a deadline. A render that is still queued when its
+    deadline passes is dropped, and the waiting request gets
+    `SchedulerBusy`.
+
+    Pillow releases the GIL while decoding, resizing and encoding, so
+    renders on the pool threads run in parallel and share the engine's
+    in-process caches. `stats()` reports queue depth and wait times for
+    monitoring and autoscaling.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_queue: int = 32,
+                 timeout: float = 10.0, window: int = 1024):
+        """
+        Starts the worker threads.
+
+        Args:
+            workers (int): Renders run at once. Defaults to the CPU count.
+            max_queue (int): Renders that may wait for a worker. Defaults to 32.
+            timeout (float): Default deadline in seconds from submission to
+                             finished render. Defaults to 10.
+            window (int): Number of recent renders the wait and render time
+                          percentiles are computed over. Defaults to 1024.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._wait_times = deque(maxlen=window)
+        self._render_times = deque(maxlen=window)
+        self._running = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.expired = 0
+        self._threads = [threading.Thread(target=self._work, name=f'render-{i}', daemon=True)
+                         for i in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def _work(self) -> None:
+        """
+        Worker loop: takes renders off the queue and runs them.
+        """
+        while True:
+            future, fn, args, kwargs, enqueued, deadline = self._queue.get()
+            started = time.monotonic()
+            if started >= deadline:
+                future.cancel()
+            # False when the deadline passed or the caller already gave up
+            runnable = future.set_running_or_notify_cancel()
+            with self._lock:
+                self._wait_times.append(started - enqueued)
+                if runnable:
+                    self._running += 1
+                else:
+                    self.expired += 1
+
+            if runnable:
+                try:
+                    result = fn(*args, **kwargs)
+                    error = None
+                except BaseException as e:
+                    error = e
+                with self._lock:
+                    self._running -= 1
+                    self._render_times.append(time.monotonic() - started)
+                    if error is None:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+                if error is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(error)
+            self._queue.task_done()
+
+    def retry_after(self) -> int:
+        """
+        Estimates how long the current backlog takes to drain.
+
+        Returns:
+            int: Seconds, at least 1.
+        """
+        with self._lock:
+            render_times = list(self._render_times)
+        average = sum(render_times) / len(render_times) if render_times else 1.0
+        backlog = self._queue.qsize() + self._running
+        return max(1, math.ceil(backlog * average / self.workers))
+
+    def submit(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Future:
+        """
+        Queues `fn(*args, **kwargs)` without waiting for it.
+
+        Used directly by asynchronous callers, which await the returned
+        future (e.g. through `asyncio.wrap_future`) instead of blocking.
+
+        Args:
+            fn (callable): The render, e.g. `MemeEngine.make_meme`.
+            timeout (float): Deadline in seconds for this render. Defaults to
+                             the scheduler's timeout.
+
+        Returns:
+            Future: Resolves to the return value of `fn`. It is cancelled if
+                    the render is still queued when the deadline passes.
+
+        Raises:
+            SchedulerBusy: If the queue is full.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        future = Future()
+        enqueued = time.monotonic()
+        try:
+            self._queue.put_nowait((future, fn, args, kwargs, enqueued, enqueued + timeout))
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            raise SchedulerBusy("Render queue is full", self.retry_after())
+        with self._lock:
+            self.submitted += 1
+        return future
+
+    def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs):
+        """
+        Queues `fn(*args, **kwargs)` and waits for its result.
+
+        Args:
+            fn (callable): The render, e.g. `MemeEngine.make_meme`.
+            timeout (float): Deadline in seconds for this render. Defaults to
+                             the scheduler's timeout.
+
+        Returns:
+            The return value of `fn`.
+
+        Raises:
+            SchedulerBusy: If the queue is full or the deadline passed.
+            Exception: Whatever `fn` raised.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        future = self.submit(fn, *args, timeout=timeout, **kwargs)
+        wait((future,), timeout=timeout)
+        # A render that has not started yet is dropped by the worker
+        future.cancel()
+        # Only a missed deadline is reported as busy; errors raised by `fn`,
+        # including its own timeouts, come out of result() unchanged
+        if future.cancelled() or not future.done():
+            raise SchedulerBusy(f"Render did not finish within {timeout:g}s", self.retry_after())
+        return future.result()
+
+    @staticmethod
+    def _percentile(values: list, fraction: float) -> float:
+        """
+        Returns the value at `fraction` (0-1) of the sorted values, or 0.
+        """
+        if not values:
+            return 0.0
+        values = sorted(values)
+        return values[min(len(values) - 1, int(fraction * len(values)))]
+
+    def stats(self) -> dict:
+        """
+        Reports queue depth, wait and render times and counters.
+
+        Times are in seconds, over the most recent renders.
+
+        Returns:
+            dict: The metrics.
+        """
+        with self._lock:
+            wait_times = list(self._wait_times)
+            render_times = list(self._render_times)
+            counters = {
+                'workers': self.workers,
+                'running': self._running,
+                'queue_depth': self._queue.qsize(),
+                'max_queue': self.max_queue,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'expired': self.expired,
+            }
+        counters.update({
+            'wait_p50': self._percentile(wait_times, 0.5),
+            'wait_p95': self._percentile(wait_times, 0.95),
+            'wait_max': max(wait_times, default=0.0),
+            'render_p50': self._percentile(render_times, 0.5),
+            'render_p95': self._percentile(render_times, 0.95),
+        })
+        return counters
@@ -0,0 +1,283 @@
+"""
+Caption layout for memes: word wrapping, auto-fit sizing and cached overlays.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import List, NamedTuple, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from .FontCache import SIZE_BUCKETS, FontCache
+
+# Distance in pixels between the caption and the image's left, right and bottom edges
+CAPTION_MARGIN = 10
+
+# Fraction of the image height the caption may cover
+MAX_CAPTION_HEIGHT = 0.5
+
+ELLIPSIS = '...'
+
+
+class CaptionLayout(NamedTuple):
+    """
+    Lines and metrics of a laid-out caption.
+    """
+    font_size: int     # Size bucket the caption is drawn at
+    lines: tuple       # Wrapped body lines followed by the author line(s)
+    line_height: int   # Distance in pixels between baselines
+    height: int        # Total height of the lines in pixels
+
+
+class TextLayout:
+    """
+    Lays out meme captions and caches the results.
+
+    The quote body and the '- author' line are word-wrapped to the image
+    width and drawn at the largest size bucket (up to a size derived from
+    the image height) that keeps the caption within the bottom half of the
+    image, found by binary search over the buckets. Text that does not fit
+    even at the smallest size is cut off with an ellipsis.
+
+    Layouts are memoized by (text, author, font, box width, size and height
+    limits), and each caption is also kept as a rendered RGBA tile as wide
+    as the image. Rendering a popular quote again only composites the
+    cached tile onto the base image. Both caches are LRU: layouts are
+    bounded by count and tiles by their total size in bytes.
+    """
+
+    def __init__(self, fonts: FontCache, max_layouts: int = 4096,
+                 tile_cache_bytes: int = 16 * 1024 * 1024):
+        """
+        Initializes empty layout and tile caches.
+
+        Args:
+            fonts (FontCache): Provides the font at each size bucket.
+            max_layouts (int): Upper bound on the number of memoized layouts.
+            tile_cache_bytes (int): Upper bound on the memory held by cached
+                                    caption tiles. 0 disables the tile cache.
+                                    Defaults to 16 MiB.
+        """
+        self.fonts = fonts
+        self.max_layouts = max_layouts
+        self.tile_cache_bytes = tile_cache_bytes
+        self.tile_bytes = 0
+        self.layout_hits = 0
+        self.layout_misses = 0
+        self.tile_hits = 0
+        self.tile_misses = 0
+        self._layouts = OrderedDict()
+        self._tiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def wrap(text: str, font: ImageFont.ImageFont, max_width: int) -> List[str]:
+        """
+        Greedily word-wraps text to fit a width.
+
+        Words wider than `max_width` on their own are broken between
+        characters. Explicit line breaks in the text are kept.
+
+        Args:
+            text (str): The text to wrap.
+            font (ImageFont.ImageFont): The font used to measure the text.
+            max_width (int): The width available, in pixels.
+
+        Returns:
+            List[str]: The wrapped lines.
+        """
+        lines = []
+        for paragraph in text.splitlines() or ['']:
+            line = ''
+            for word in paragraph.split():
+                candidate = f"{line} {word}" if line else word
+                if font.getlength(candidate) <= max_width:
+                    line = candidate
+                    continue
+                if line:
+                    lines.append(line)
+                line = word
+                # A single word wider than the box is split across lines
+                while font.getlength(line) > max_width and len(line) > 1:
+                    cut = len(line) - 1
+                    while cut > 1 and font.getlength(line[:cut]) > max_width:
+                        cut -= 1
+                    lines.append(line[:cut])
+                    line = line[cut:]
+            lines.append(line)
+        return lines
+
+    def _layout_at(self, text: str, author: str, size: int, box_width: int) -> CaptionLayout:
+        """
+        Wraps the caption at one font size.
+        """
+        font, font_size = self.fonts.get(size)
+        ascent, descent = font.getmetrics()
+        line_height = max(font_size, ascent + descent)
+        lines = self.wrap(text, font, box_width) + self.wrap(f"- {author}", font, box_width)
+        return CaptionLayout(font_size, tuple(lines), line_height, line_height * len(lines))
+
+    def _truncate(self, layout: CaptionLayout, author: str, box_width: int,
+                  max_height: int) -> CaptionLayout:
+        """
+        Cuts a caption that is too tall at the smallest size, keeping the
+        author line(s) and ending the last body line with an ellipsis.
+        """
+        font, _ = self.fonts.get(layout.font_size)
+        author_lines = self.wrap(f"- {author}", font, box_width)
+        body_lines = list(layout.lines[:len(layout.lines) - len(author_lines)])
+        keep = max(1, max_height // layout.line_height - len(author_lines))
+        body_lines = body_lines[:keep]
+        last = body_lines[-1] if body_lines else ''
+        while last and font.getlength(last + ELLIPSIS) > box_width:
+            last = last[:-1]
+        body_lines[-1:] = [last.rstrip() + ELLIPSIS]
+        lines = tuple(body_lines + author_lines)
+        return layout._replace(lines=lines, height=layout.line_height * len(lines))
+
+    def layout(self, text: str, author: str, box_width: int, max_size: int,
+               max_height: int) -> CaptionLayout:
+        """
+        Returns the memoized layout of a caption, computing it on a miss.
+
+        Args:
+            text (str): The quote body.
+            author (str): The quote author.
+            box_width (int): The width available for each line, in pixels.
+            max_size (int): The largest font size to use.
+            max_height (int): The height the caption may take, in pixels.
+
+        Returns:
+            CaptionLayout: The wrapped lines at the chosen size.
+        """
+        key = (text, author, self.fonts.font_path, box_width, max_size, max_height)
+        with self._lock:
+            cached = self._layouts.get(key)
+            if cached is not None:
+                self._layouts.move_to_end(key)
+                self.layout_hits += 1
+                return cached
+            self.layout_misses += 1
+
+        # Binary search for the largest bucket whose caption fits the height
+        sizes = [size for size in SIZE_BUCKETS if size <= max_size] or [SIZE_BUCKETS[0]]
+        low, high = 0, len(sizes) - 1
+        best = None
+        while low <= high:
+            middle = (low + high) // 2
+            candidate = self._layout_at(text, author, sizes[middle], box_width)
+            if candidate.height <= max_height:
+                best = candidate
+                low = middle + 1
+            else:
+                high = middle - 1
+        if best is None:
+            best = self._truncate(self._layout_at(text, author, sizes[0], box_width),
+                                  author, box_width, max_height)
+
+        with self._lock:
+            self._layouts[key] = best
+            while len(self._layouts) > self.max_layouts:
+                self._layouts.popitem(last=False)
+        return best
+
+    def caption_tile(self, text: str, author: str, image_size: Tuple[int, int]
+                     ) -> Tuple[Image.Image, CaptionLayout]:
+        """
+        Returns the caption rendered as a transparent RGBA tile.
+
+        The tile is as wide as the image and as tall as the caption. It
+        can be composited onto any base image with that width and a
+        height that gives the same layout, and it must not be modified.
+
+        Args:
+            text (str): The quote body.
+            author (str): The quote author.
+            image_size (tuple): (width, height) of the base image.
+
+        Returns:
+            tuple: The tile and its layout.
+        """
+        width, height = image_size
+        # The largest size follows the image height, as the fixed layout did
+        layout = self.layout(text, author, max(1, width - 2 * CAPTION_MARGIN),
+                             int(height / 15), int(height * MAX_CAPTION_HEIGHT))
+
+        key = (layout, self.fonts.font_path, width)
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                self.tile_hits += 1
+                return tile, layout
+            self.tile_misses += 1
+
+        tile = self.render(layout, width)
+        tile_bytes = tile.width * tile.height * 4
+        if tile_bytes <= self.tile_cache_bytes:
+            with self._lock:
+                if key not in self._tiles:
+                    self._tiles[key] = tile
+                    self.tile_bytes += tile_bytes
+                while self.tile_bytes > self.tile_cache_bytes:
+                    _, evicted = self._tiles.popitem(last=False)
+                    self.tile_bytes -= evicted.width * evicted.height * 4
+        return tile, layout
+
+    def render(self, layout: CaptionLayout, width: int) -> Image.Image:
+        """
+        Draws a laid-out caption onto a new transparent tile.
+
+        Args:
+            layout (CaptionLayout): The caption to draw.
+            width (int): The tile width, normally the image width.
+
+        Returns:
+            Image.Image: An RGBA image with white text on a transparent background.
+        """
+        font, _ = self.fonts.get(layout.font_size)
+        tile = Image.new('RGBA', (width, max(1, layout.height)), (255, 255, 255, 0))
+        draw = ImageDraw.Draw(tile)
+        for index, line in enumerate(layout.lines):
+            draw.text((CAPTION_MARGIN, index * layout.line_height), line,
+                      font=font, fill=(255, 255, 255, 255))
+        return tile
+
+    def draw(self, img: Image.Image, text: str, author: str) -> Image.Image:
+        """
+        Composites the caption onto the bottom of an image.
+
+        Args:
+            img (Image.Image): The base image. RGB and RGBA images are drawn
+                               on in place; other modes are converted first.
+            text (str): The quote body.
+            author (str): The quote author.
+
+        Returns:
+            Image.Image: The captioned image, `img` itself unless converted.
+        """
+        if img.mode not in ('RGB', 'RGBA'):
+            has_alpha = 'A' in img.getbands() or 'transparency' in img.info
+            img = img.convert('RGBA' if has_alpha else 'RGB')
+        tile, layout = self.caption_tile(text, author, img.size)
+        img.paste(tile, (0, img.height - CAPTION_MARGIN - layout.height), tile)
+        return img
+
+    def stats(self) -> dict:
+        """
+        Reports cache counters and memory use.
+
+        Returns:
+            dict: Layout and tile hits and misses, entry counts and tile bytes.
+        """
+        with self._lock:
+            return {
+                'layout_hits': self.layout_hits,
+                'layout_misses': self.layout_misses,
+                'layouts': len(self._layouts),
+                'tile_hits': self.tile_hits,
+                'tile_misses': self.tile_misses,
+                'tiles': len(self._tiles),
+                'tile_bytes': self.tile_bytes,
+                'tile_cache_bytes': self.tile_cache_bytes,
+            }
@@ -0,0 +1,167 @@
+"""
+Pre-renders random memes at startup so requests can serve finished files.
+"""
+
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional
+
+from .MemeEngine import MemeEngine
+
+
+def print_progress(done: int, total: int) -> None:
+    """
+    Default progress callback, printing roughly every 10% of the work.
+
+    Args:
+        done (int): Number of finished renders.
+        total (int): Number of scheduled renders.
+    """
+    step = max(1, total // 10)
+    if done == total or done % step == 0:
+        print(f"Warm-up: rendered {done}/{total} memes")
+
+
+class MemePool:
+    """
+    Thread-safe collection of finished meme files to serve at random.
+
+    Each meme is kept with the job it was rendered from, so entries made
+    from a changed image or quote can be discarded.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty pool.
+        """
+        self._paths = []
+        self._jobs = []
+        self._lock = threading.Lock()
+        self.done = threading.Event()
+
+    def add(self, path: str, job: tuple = ()) -> None:
+        """
+        Adds a finished meme to the pool.
+
+        Args:
+            path (str): The path to the rendered meme.
+            job (tuple): The (img_path, body, author) job it was rendered from.
+        """
+        with self._lock:
+            self._paths.append(path)
+            self._jobs.append(job)
+
+    def discard(self, predicate: Callable[[tuple], bool]) -> int:
+        """
+        Removes the memes whose job matches `predicate`.
+
+        Args:
+            predicate (callable): Called with each (img_path, body, author) job.
+
+        Returns:
+            int: The number of memes removed.
+        """
+        with self._lock:
+            keep = [i for i, job in enumerate(self._jobs) if not predicate(job)]
+            removed = len(self._paths) - len(keep)
+            self._paths = [self._paths[i] for i in keep]
+            self._jobs = [self._jobs[i] for i in keep]
+            return removed
+
+    def choice(self) -> Optional[str]:
+        """
+        Picks a random finished meme.
+
+        Returns:
+            str: A meme path, or None while the pool is still empty.
+        """
+        with self._lock:
+            return random.choice(self._paths) if self._paths else None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._paths)
+
+
+def warm_up(engine: MemeEngine, imgs: List[str], quotes: list,
+            limit: Optional[int] = None, workers: Optional[int] = None,
+            pool: Optional[MemePool] = None,
+            progress: Optional[Callable[[int, int], None]] = print_progress,
+            executor: Optional[ProcessPoolExecutor] = None) -> MemePool:
+    """
+    Renders every (image x quote) pair, or a random sample of them, into a pool.
+
+    Rendering runs on a process pool through `MemeEngine.make_memes`.
+    Because output names are content addressed, memes that already exist
+    on disk are only checked, not re-rendered, so repeated boots are cheap.
+
+    Args:
+        engine (MemeEngine): Engine whose settings the workers use.
+        imgs (list): Paths of the source images.
+        quotes (list): QuoteModel objects to combine with the images.
+        limit (int): Maximum number of memes in the pool. When the full
+                     image x quote space is larger, a random subset is
+                     rendered. None renders every pair.
+        workers (int): Number of worker processes. Defaults to the CPU count.
+        pool (MemePool): Pool to fill. A new one is created if omitted.
+        progress (callable): Called as progress(done, total) after each render.
+        executor (ProcessPoolExecutor): Pool from `MemeEngine.worker_pool` to
+                                        render on. Defaults to a new pool.
+
+    Returns:
+        MemePool: The filled pool; its `done` event is set when warm-up ends.
+    """
+    pool = pool if pool is not None else MemePool()
+    total = len(imgs) * len(quotes)
+    if limit is not None and total > limit:
+        indices = random.sample(range(total), limit)
+    else:
+        indices = range(total)
+
+    jobs = []
+    for index in indices:
+        quote = quotes[index % len(quotes)]
+        jobs.append((imgs[index // len(quotes)], quote.body, quote.author))
+
+    try:
+        for done, result in enumerate(engine.make_memes(jobs, workers=workers,
+                                                        executor=executor), 1):
+            if result.error:
+                print(f"Warning: Warm-up render failed for {result.job[0]}: {result.error}")
+            else:
+                pool.add(result.path, result.job)
+            if progress:
+                progress(done, len(jobs))
+    except Exception as e:
+        print(f"Warning: Warm-up aborted: {e}")
+    finally:
+        pool.done.set()
+    return pool
+
+
+def start_warm_up(engine: MemeEngine, imgs: List[str], quotes: list,
+                  limit: Optional[int] = None, workers: Optional[int] = None) -> MemePool:
+    """
+    Runs `warm_up` on a background thread and returns its pool immediately.
+
+    The pool fills while the application is already serving requests. The
+    render processes are started before the thread, in the calling thread,
+    so call this before the application starts threads of its own.
+
+    Returns:
+        MemePool: The pool being filled.
+    """
+    pool = MemePool()
+    executor = engine.worker_pool(workers) if workers != 1 else None
+
+    def run():
+        try:
+            warm_up(engine, imgs, quotes, limit=limit, workers=workers, pool=pool,
+                    executor=executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    threading.Thread(target=run, name='meme-warm-up', daemon=True).start()
+    return pool
@@ -0,0 +1,21 @@
+"""
+MemeEngine package for rendering quotes onto images.
+"""
+from .MemeEngine import MemeEngine, MemeJobResult
+from .ImageCache import ImageCache
+from .ImagePyramid import ImagePyramid
+from .FontCache import FontCache
+from .Encoder import Encoder
+from .MemeStore import MemeStore
+from .RenderScheduler import RenderScheduler
+
+# Define what gets imported when someone does `from MemeEngine import *`
+__all__ = ['MemeEngine', 'MemeJobResult', 'ImageCache', 'ImagePyramid', 'FontCache', 'MemeStore', 'Encoder', 'RenderScheduler', 'RemoteImageCache']
+
+
+def __getattr__(name):
+    """ Imports RemoteImageCache, and with it `requests`, only when it is used """
+    if name == 'RemoteImageCache':
+        from .RemoteImageCache import RemoteImageCache
+        return RemoteImageCache
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,28 +2,35 @@
 Ingestor for Comma Separated Values (.csv) files.
 """
 
+import logging
 import pandas as pd
-from typing import List
+from typing import Iterator, List, Optional
 from .IngestorInterface import IngestorInterface
 from .QuoteModel import QuoteModel
 
+logger = logging.getLogger(__name__)
+
 
 class CSVIngestor(IngestorInterface):
     """
     Concrete ingestor for CSV files.
 
     It assumes the CSV file has 'body' and 'author' columns.
-    Uses pandas for robust CSV parsing.
+    Uses pandas for robust CSV parsing; rows are cleaned and filtered with
+    column-wide string operations rather than row by row.
     """
 
     allowed_extensions = ['csv']
+    chunk_size = 10000  # Rows read per chunk by iter_parse
+    malformed_sample_size = 5  # Row numbers listed in the malformed-row warning
 
     @classmethod
     def parse(cls, path: str) -> List[QuoteModel]:
         """
         Parses a .csv file and extracts quotes.
 
-        Assumes the CSV has 'body' and 'author' columns.
+        Assumes the CSV has 'body' and 'author' columns. The whole file is
+        read at once; use `iter_parse` for files too large for memory.
 
         Args:
             path (str): The path to the .csv file.
@@ -34,33 +41,89 @@ class CSVIngestor(IngestorInterface):
         Raises:
             Exception: If the file cannot be read or required columns are missing.
         """
+        return list(cls._iter_quotes(path, None))
+
+    @classmethod
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Parses a .csv file in chunks of `chunk_size` rows, yielding quotes.
+
+        Args:
+            path (str): The path to the .csv file.
+
+        Yields:
+            QuoteModel: Each quote in the file.
+        """
+        return cls._iter_quotes(path, cls.chunk_size)
+
+    @classmethod
+    def _iter_quotes(cls, path: str, chunk_size: Optional[int]) -> Iterator[QuoteModel]:
+        """
+        Yields the quotes of a .csv file, read whole or in chunks.
+
+        Malformed rows are counted and reported once, with a sample of
+        their row numbers, after the file has been read.
+
+        Args:
+            path (str): The path to the .csv file.
+            chunk_size (int): Rows per chunk, or None to read the whole file.
+
+        Yields:
+            QuoteModel: Each quote in the file.
+        """
         if not cls.can_ingest(path):
             raise Exception(f"Cannot ingest file type for {path}. Expected .csv")
 
-        quotes = []
+        skipped = 0
+        sample = []
         try:
-            # Use pandas to read CSV, which handles various delimiters, quotes, etc.
-            df = pd.read_csv(path)
-
-            # Check if 'body' and 'author' columns exist
-            if 'body' not in df.columns or 'author' not in df.columns:
-                raise ValueError(f"CSV file {path} must contain 'body' and 'author' columns.")
-
-            for index, row in df.iterrows():
-                body = str(row['body']).strip()
-                author = str(row['author']).strip()
-                if body and author: # Ensure both parts are non-empty
-                    quotes.append(QuoteModel(body, author))
-                else:
-                    print(f"Warning: Skipped malformed row {index} in {path} (body or author missing): {row.to_dict()}")
+            for df in cls._read_frames(path, chunk_size):
+                # Check if 'body' and 'author' columns exist
+                if 'body' not in df.columns or 'author' not in df.columns:
+                    raise ValueError(f"CSV file {path} must contain 'body' and 'author' columns.")
+
+                body = df['body'].str.strip()
+                author = df['author'].str.strip()
+                valid = (body != '') & (author != '')  # Ensure both parts are non-empty
+
+                invalid_rows = df.index[~valid]
+                skipped += len(invalid_rows)
+                sample.extend(invalid_rows[:cls.malformed_sample_size - len(sample)].tolist())
+
+                yield from map(QuoteModel, body[valid].tolist(), author[valid].tolist())
         except FileNotFoundError:
-            print(f"Error: File not found at {path}")
+            logger.error("File not found at %s", path)
         except pd.errors.EmptyDataError:
-            print(f"Error: CSV file {path} is empty or has no data.")
+            logger.error("CSV file %s is empty or has no data.", path)
         except pd.errors.ParserError as e:
-            print(f"Error parsing CSV file {path}: {e}")
+            logger.error("Error parsing CSV file %s: %s", path, e)
         except ValueError as e:
-            print(f"Data error in CSV file {path}: {e}")
+            logger.error("Data error in CSV file %s: %s", path, e)
         except Exception as e:
-            print(f"An unexpected error occurred while parsing {path}: {e}")
-        return quotes
+            logger.error("An unexpected error occurred while parsing %s: %s", path, e)
+
+        if skipped:
+            logger.warning("Skipped %d malformed row(s) in %s (body or author missing), e.g. rows %s",
+                           skipped, path, sample)
+
+    @staticmethod
+    def _read_frames(path: str, chunk_size: Optional[int]) -> Iterator[pd.DataFrame]:
+        """
+        Reads a CSV file as string columns, whole or in chunks.
+
+        Missing fields are read as empty strings rather than NaN, so they
+        are filtered out as malformed instead of becoming the text 'nan'.
+
+        Args:
+            path (str): The path to the .csv file.
+            chunk_size (int): Rows per chunk, or None for a single frame.
+
+        Yields:
+            pd.DataFrame: The file's rows.
+        """
+        options = {'dtype': str, 'keep_default_na': False}
+        if chunk_size is None:
+            yield pd.read_csv(path, **options)
+            return
+        with pd.read_csv(path, chunksize=chunk_size, **options) as reader:
+            yield from reader
@@ -0,0 +1,143 @@
+"""
+Persistent cache of parsed quotes, keyed by each source file's fingerprint.
+"""
+
+import logging
+import os
+import pickle
+from typing import List, Optional
+
+from .Ingestor import Ingestor
+from .QuoteModel import QuoteModel
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cache layout or the ingestors' output changes. Compiled corpora
+# record it too, so both are rebuilt from the sources after a bump.
+CACHE_VERSION = 2
+
+
+class CorpusCache:
+    """
+    Loads quotes from source files, re-parsing only files that changed.
+
+    Parsed quotes are stored in a single pickle file as (body, author)
+    tuples per source, together with that source's fingerprint (size and
+    mtime, plus the text extraction backend for PDFs). On load, unchanged sources come straight from the cache
+    and only new or modified ones go through `Ingestor.parse`, so start-up
+    no longer pays for pdftotext, DOCX or pandas on every run.
+    """
+
+    def __init__(self, cache_path: str):
+        """
+        Initializes the cache.
+
+        Args:
+            cache_path (str): The cache file, typically next to the quote files.
+        """
+        self.cache_path = cache_path
+        self.failed = []  # Source files that could not be parsed by the last load
+
+    @staticmethod
+    def fingerprint(path: str) -> tuple:
+        """
+        Returns the fingerprint of a source file.
+
+        It is the file's (size, mtime). PDFs also record the PDF backend
+        that would parse them, because pypdf and pdftotext can extract
+        different text from the same file. Switching backends therefore
+        re-parses the PDFs.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        stat = os.stat(path)
+        if Ingestor._extension(path) == 'pdf':
+            pdf_ingestor = Ingestor.ingestor_for_extension('pdf')
+            try:
+                backend = pdf_ingestor.resolve_backend()
+            except ValueError:
+                # Unknown backend name; parsing reports the error
+                backend = pdf_ingestor.backend
+            return (stat.st_size, stat.st_mtime_ns, backend)
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def _read(self) -> dict:
+        """
+        Reads the cache file.
+
+        Returns:
+            dict: Maps absolute source path to (fingerprint, quotes); empty if
+                  the cache is missing, unreadable or from another version.
+        """
+        try:
+            with open(self.cache_path, 'rb') as f:
+                version, entries = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            return {}
+        return entries if version == CACHE_VERSION else {}
+
+    def _write(self, entries: dict) -> None:
+        """
+        Atomically replaces the cache file.
+        """
+        temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                pickle.dump((CACHE_VERSION, entries), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            logger.warning("Could not write quote cache %s: %s", self.cache_path, e)
+
+    def load(self, paths: List[str], workers: Optional[int] = None) -> List[QuoteModel]:
+        """
+        Returns the quotes of every source file, in the order given.
+
+        Changed files are parsed concurrently with `Ingestor.parse_each`.
+        Files that fail to parse are reported and skipped; they are not
+        cached, so they are retried on the next load.
+
+        Args:
+            paths (list): Quote source files.
+            workers (int): Threads used to parse changed files.
+
+        Returns:
+            List[QuoteModel]: The quotes from all files.
+        """
+        entries = self._read()
+        fingerprints = {}
+        stale = []
+        for path in paths:
+            try:
+                fingerprints[path] = self.fingerprint(path)
+            except FileNotFoundError:
+                logger.error("Could not parse %s: File not found: %s", path, path)
+                continue
+            cached = entries.get(os.path.abspath(path))
+            if cached is None or cached[0] != fingerprints[path]:
+                stale.append(path)
+
+        parsed = {}
+        failed = set()
+        self.failed = [path for path in paths if path not in fingerprints]
+        for path, file_quotes, error in Ingestor.parse_each(stale, workers):
+            if error:
+                logger.error("Could not parse %s: %s", path, error)
+                failed.add(path)
+                self.failed.append(path)
+                continue
+            entries[os.path.abspath(path)] = (fingerprints[path],
+                                              [(q.body, q.author) for q in file_quotes])
+            parsed[path] = file_quotes
+
+        quotes = []
+        for path in paths:
+            if path in parsed:
+                quotes.extend(parsed[path])
+            elif path in fingerprints and path not in failed:
+                cached = entries[os.path.abspath(path)][1]
+                quotes.extend(QuoteModel(body, author) for body, author in cached)
+
+        if parsed:
+            self._write(entries)
+        return quotes
@@ -2,18 +2,28 @@
 Ingestor for Microsoft Word (.docx) files.
 """
 
-from typing import List
+import logging
+import zipfile
+from typing import Iterable, Iterator, List
+from xml.etree.ElementTree import ParseError, iterparse
 from .IngestorInterface import IngestorInterface
 from .QuoteModel import QuoteModel
 
-# To install: pip install python-docx
-try:
-    from docx import Document
-    from docx.opc.exceptions import PackageNotFoundError
-except ImportError:
-    Document = None
-    PackageNotFoundError = None
-    print("Warning: python-docx library not found. DOCX ingestion will be disabled.")
+logger = logging.getLogger(__name__)
+
+# WordprocessingML as written by Word, LibreOffice and Google Docs
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+DOCUMENT_PART = 'word/document.xml'
+
+# Run content that python-docx renders as text, besides <w:t> and <w:br>
+RUN_TEXT = {W + 'tab': '\t', W + 'ptab': '\t', W + 'cr': '\n', W + 'noBreakHyphen': '-'}
+
+
+class UnusualDocumentError(Exception):
+    """
+    Raised by the streaming reader for documents it does not handle, such
+    as Strict OOXML or a main part that is not word/document.xml.
+    """
 
 
 class DOCXIngestor(IngestorInterface):
@@ -22,7 +32,11 @@ class DOCXIngestor(IngestorInterface):
 
     It extracts text from paragraphs and attempts to parse quotes
     in the format '"body" - Author' or 'body - Author'.
-    Requires 'python-docx' library.
+
+    Paragraphs are streamed straight from the document XML inside the
+    .docx zip, so memory use does not grow with the document. Documents
+    the streaming reader does not understand are read with the
+    'python-docx' library instead, which is only imported when needed.
     """
 
     allowed_extensions = ['docx']
@@ -39,40 +53,167 @@ class DOCXIngestor(IngestorInterface):
             List[QuoteModel]: A list of QuoteModel objects.
 
         Raises:
-            ImportError: If 'python-docx' is not installed.
+            ImportError: If the document needs 'python-docx' and it is not installed.
             Exception: For other file access or parsing errors.
         """
+        return list(cls.iter_parse(path))
+
+    @classmethod
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Parses a .docx file, yielding quotes paragraph by paragraph.
+
+        Args:
+            path (str): The path to the .docx file.
+
+        Yields:
+            QuoteModel: Each quote in the document.
+        """
         if not cls.can_ingest(path):
             raise Exception(f"Cannot ingest file type for {path}. Expected .docx")
 
-        if Document is None:
+        started = False
+        try:
+            for quote in cls._parse_paragraphs(path, cls.iter_paragraphs(path)):
+                started = True
+                yield quote
+            return
+        except FileNotFoundError:
+            logger.error("File not found at %s", path)
+            return
+        except (UnusualDocumentError, zipfile.BadZipFile, ParseError) as e:
+            # Falling back after quotes were yielded would repeat them
+            if started:
+                logger.error("An unexpected error occurred while parsing %s: %s", path, e)
+                return
+        except Exception as e:
+            logger.error("An unexpected error occurred while parsing %s: %s", path, e)
+            return
+
+        yield from cls._iter_python_docx(path)
+
+    @staticmethod
+    def iter_paragraphs(path: str) -> Iterator[str]:
+        """
+        Streams the text of each top-level body paragraph of a .docx file.
+
+        Only the XML of the paragraph being read is kept in memory. The
+        text matches python-docx's `paragraph.text`: it is read from the
+        paragraph's own runs and the runs of its hyperlinks. Runs nested
+        in anything else, such as tracked insertions and deletions,
+        content controls, fields and text boxes, are skipped, as are
+        tables.
+
+        Args:
+            path (str): The path to the .docx file.
+
+        Yields:
+            str: The text of each paragraph, in document order.
+
+        Raises:
+            UnusualDocumentError: If the document is not in the expected layout.
+            zipfile.BadZipFile: If the file is not a zip archive.
+            xml.etree.ElementTree.ParseError: If the document XML is malformed.
+        """
+        with zipfile.ZipFile(path) as archive:
+            try:
+                part = archive.open(DOCUMENT_PART)
+            except KeyError:
+                raise UnusualDocumentError(f"{path} has no {DOCUMENT_PART}")
+
+            with part:
+                stack = []
+                body = None
+                paragraph = None  # The top-level paragraph being read
+                pieces = None  # Its text so far
+                for event, elem in iterparse(part, events=('start', 'end')):
+                    if event == 'start':
+                        if elem.tag == W + 'body' and len(stack) == 1:
+                            body = elem
+                        elif elem.tag == W + 'p' and stack and stack[-1] is body:
+                            paragraph = elem
+                            pieces = []
+                        stack.append(elem)
+                        continue
+
+                    stack.pop()
+                    if paragraph is None:
+                        if elem.tag == W + 'body':
+                            body.clear()
+                        elif stack and stack[-1] is body:
+                            body.clear()  # Tables and section properties
+                        continue
+
+                    if elem is paragraph:
+                        yield ''.join(pieces)
+                        paragraph = pieces = None
+                        body.clear()
+                        continue
+
+                    # Only runs directly in the paragraph or in one of its
+                    # hyperlinks count, as in python-docx
+                    if stack[-1].tag != W + 'r':
+                        continue
+                    run_parent = stack[-2]
+                    if not (run_parent is paragraph or (run_parent.tag == W + 'hyperlink'
+                                                        and stack[-3] is paragraph)):
+                        continue
+                    if elem.tag == W + 't':
+                        pieces.append(elem.text or '')
+                    elif elem.tag == W + 'br':
+                        # Page and column breaks have no text
+                        if elem.get(W + 'type', 'textWrapping') == 'textWrapping':
+                            pieces.append('\n')
+                    elif elem.tag in RUN_TEXT:
+                        pieces.append(RUN_TEXT[elem.tag])
+
+                if body is None:
+                    # Strict OOXML uses another namespace and is left to python-docx
+                    raise UnusualDocumentError(f"{path} has no WordprocessingML body")
+
+    @classmethod
+    def _iter_python_docx(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Reads the document with python-docx, for documents the streaming
+        reader does not handle.
+        """
+        # To install: pip install python-docx
+        try:
+            from docx import Document
+            from docx.opc.exceptions import PackageNotFoundError
+        except ImportError:
             raise ImportError(
                 "The 'python-docx' library is not installed. "
                 "Please install it using 'pip install python-docx' to enable DOCX ingestion."
             )
 
-        quotes = []
         try:
             document = Document(path)
-            for paragraph in document.paragraphs:
-                line = paragraph.text.strip()
-                if not line:  # Skip empty lines
-                    continue
-
-                if ' - ' in line:
-                    parts = line.split(' - ', 1)
-                    body = parts[0].strip().strip('"')
-                    author = parts[1].strip()
-                    if body and author:
-                        quotes.append(QuoteModel(body, author))
-                    else:
-                        print(f"Warning: Skipped malformed paragraph in {path} (body or author missing): '{line}'")
-                else:
-                    print(f"Warning: Skipped paragraph in {path} due to missing ' - ' separator: '{line}'")
+            yield from cls._parse_paragraphs(path, (p.text for p in document.paragraphs))
         except FileNotFoundError:
-            print(f"Error: File not found at {path}")
+            logger.error("File not found at %s", path)
         except PackageNotFoundError:
-            print(f"Error: Invalid or corrupt DOCX file at {path}")
+            logger.error("Invalid or corrupt DOCX file at %s", path)
         except Exception as e:
-            print(f"An unexpected error occurred while parsing {path}: {e}")
-        return quotes
+            logger.error("An unexpected error occurred while parsing %s: %s", path, e)
+
+    @staticmethod
+    def _parse_paragraphs(path: str, paragraphs: Iterable[str]) -> Iterator[QuoteModel]:
+        """
+        Yields the quotes found in paragraph texts.
+        """
+        for text in paragraphs:
+            line = text.strip()
+            if not line:  # Skip empty lines
+                continue
+
+            if ' - ' in line:
+                parts = line.split(' - ', 1)
+                body = parts[0].strip().strip('"')
+                author = parts[1].strip()
+                if body and author:
+                    yield QuoteModel(body, author)
+                else:
+                    logger.warning("Skipped malformed paragraph in %s (body or author missing): '%s'", path, line)
+            else:
+                logger.warning("Skipped paragraph in %s due to missing ' - ' separator: '%s'", path, line)
@@ -2,16 +2,34 @@
 The main Ingestor class that orchestrates quote parsing based on file type.
 """
 
-from typing import List
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple, Type, Union
 from .IngestorInterface import IngestorInterface
 from .QuoteModel import QuoteModel
-from .CSVIngestor import CSVIngestor
-from .DOCXIngestor import DOCXIngestor
-from .PDFIngestor import PDFIngestor
-from .TextIngestor import TextIngestor
 
+import glob
+import importlib
 import os
 
+logger = logging.getLogger(__name__)
+
+
+def _parse_safely(path: str) -> Tuple[List[QuoteModel], Optional[str]]:
+    """
+    Parses one file for `Ingestor.parse_each`, capturing any error.
+
+    Defined at module level so it can run in a process pool.
+
+    Returns:
+        tuple: (quotes, None) on success, or ([], error message) on failure.
+    """
+    try:
+        return Ingestor.parse(path), None
+    except Exception as e:
+        return [], str(e)
+
+
 class Ingestor(IngestorInterface):
     """
     The central Ingestor class that selects and uses the appropriate
@@ -19,19 +37,63 @@ class Ingestor(IngestorInterface):
 
     It encapsulates all helper ingestor classes and provides a unified
     interface for quote extraction.
+
+    Concrete ingestors are registered by file extension and imported the
+    first time a file with that extension is parsed, so importing the
+    package does not load pandas, python-docx or pypdf.
     """
 
-    # List of concrete ingestor classes in order of precedence (if applicable,
-    # though here order doesn't strictly matter as only one matches per extension)
-    ingestors = [TextIngestor, CSVIngestor, DOCXIngestor, PDFIngestor]
+    # File extension -> (module, class) of its concrete ingestor
+    registry = {
+        'txt': ('.TextIngestor', 'TextIngestor'),
+        'csv': ('.CSVIngestor', 'CSVIngestor'),
+        'docx': ('.DOCXIngestor', 'DOCXIngestor'),
+        'pdf': ('.PDFIngestor', 'PDFIngestor'),
+    }
+    _loaded = {}  # Extension -> imported ingestor class
+
+    @classmethod
+    def register(cls, extension: str, module: str, class_name: str) -> None:
+        """
+        Registers the ingestor for a file extension without importing it.
+
+        Args:
+            extension (str): The file extension, without the dot.
+            module (str): The module defining the ingestor. A leading dot
+                          makes it relative to this package.
+            class_name (str): The ingestor class in that module.
+        """
+        extension = extension.lower()
+        cls.registry[extension] = (module, class_name)
+        cls._loaded.pop(extension, None)
+
+    @classmethod
+    def ingestor_for_extension(cls, extension: str) -> Type[IngestorInterface]:
+        """
+        Returns the ingestor registered for an extension, importing it on first use.
+
+        Raises:
+            KeyError: If no ingestor is registered for the extension.
+        """
+        ingestor = cls._loaded.get(extension)
+        if ingestor is None:
+            module, class_name = cls.registry[extension]
+            ingestor = getattr(importlib.import_module(module, __package__), class_name)
+            cls._loaded[extension] = ingestor
+        return ingestor
+
+    @staticmethod
+    def _extension(path: str) -> str:
+        """ Returns the lower-cased extension, as `IngestorInterface.can_ingest` reads it """
+        return path.split('.')[-1].lower()
 
     @classmethod
     def parse(cls, path: str) -> List[QuoteModel]:
         """
         Parses the file at the given path using the appropriate ingestor.
 
-        Iterates through registered ingestors and uses the first one that
-        can handle the file's extension.
+        Uses the ingestor registered for the file's extension, importing
+        it if this is the first file of that type.
 
         Args:
             path (str): The full path to the file to be parsed.
@@ -42,23 +104,53 @@ class Ingestor(IngestorInterface):
         Raises:
             ValueError: If no suitable ingestor is found for the file type.
         """
-        # Ensure the path exists before attempting to parse
+        ingestor = cls._select(path)
+        logger.info("Using %s for %s", ingestor.__name__, os.path.basename(path))
+        return ingestor.parse(path)
+
+    @classmethod
+    def _select(cls, path: str):
+        """
+        Returns the concrete ingestor for `path`.
+
+        Raises:
+            FileNotFoundError: If the path does not exist.
+            IsADirectoryError: If the path is a directory.
+            ValueError: If no suitable ingestor is found for the file type.
+        """
         if not os.path.exists(path):
             raise FileNotFoundError(f"File not found: {path}")
         if not os.path.isfile(path):
             raise IsADirectoryError(f"Path is a directory, not a file: {path}")
 
-        for ingestor in cls.ingestors:
-            if ingestor.can_ingest(path):
-                print(f"Using {ingestor.__name__} for {os.path.basename(path)}")
-                return ingestor.parse(path)
-        
-        # If no ingestor can handle the file type
+        extension = cls._extension(path)
+        if extension in cls.registry:
+            return cls.ingestor_for_extension(extension)
+
         raise ValueError(
             f"No ingestor found for file type of: {path}. "
-            f"Supported extensions: {', '.join(sorted(list(set(ext for ing in cls.ingestors for ext in ing.allowed_extensions))))}"
+            f"Supported extensions: {', '.join(sorted(cls.registry))}"
         )
 
+    @classmethod
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Streams the quotes of a file using the appropriate ingestor.
+
+        Unlike `parse`, quotes are yielded as they are read, so very large
+        files are processed in constant memory.
+
+        Args:
+            path (str): The full path to the file to be parsed.
+
+        Yields:
+            QuoteModel: Each quote extracted from the file.
+
+        Raises:
+            ValueError: If no suitable ingestor is found for the file type.
+        """
+        yield from cls._select(path).iter_parse(path)
+
     @classmethod
     def can_ingest(cls, path: str) -> bool:
         """
@@ -70,4 +162,90 @@ class Ingestor(IngestorInterface):
         Returns:
             bool: True if any ingestor can process the file, False otherwise.
         """
-        return any(ingestor.can_ingest(path) for ingestor in cls.ingestors)
+        return cls._extension(path) in cls.registry
+
+    @classmethod
+    def discover(cls, sources: Union[str, Iterable[str]]) -> List[str]:
+        """
+        Expands files, directories and glob patterns into ingestible files.
+
+        Directories are searched recursively. Files found through a
+        directory or pattern are sorted, and only those with a supported
+        extension are kept; explicitly listed files are kept as given.
+
+        Args:
+            sources (str or iterable): A path, directory or glob pattern,
+                                       or an iterable of them.
+
+        Returns:
+            List[str]: The files to parse, without duplicates, in a
+                       deterministic order.
+        """
+        if isinstance(sources, str):
+            sources = [sources]
+
+        paths = []
+        for source in sources:
+            if os.path.isdir(source):
+                found = [os.path.join(root, name)
+                         for root, _, files in os.walk(source) for name in files]
+            elif os.path.isfile(source):
+                paths.append(source)
+                continue
+            else:
+                found = glob.glob(source, recursive=True)
+            paths.extend(sorted(path for path in found
+                                if os.path.isfile(path) and cls.can_ingest(path)))
+
+        return list(dict.fromkeys(paths))
+
+    @classmethod
+    def parse_each(cls, paths: List[str], workers: Optional[int] = None,
+                   use_processes: bool = False) -> List[Tuple[str, List[QuoteModel], Optional[str]]]:
+        """
+        Parses several files concurrently, reporting a result per file.
+
+        Args:
+            paths (list): The files to parse.
+            workers (int): Pool size. Defaults to the executor's default.
+            use_processes (bool): Use a process pool instead of threads. Threads
+                                  suit the pdftotext subprocess and file I/O;
+                                  processes help when parsing is CPU bound.
+
+        Returns:
+            list: (path, quotes, error) tuples in the order of `paths`, where
+                  error is None on success.
+        """
+        paths = list(paths)
+        if len(paths) <= 1 or workers == 1:
+            results = [_parse_safely(path) for path in paths]
+        else:
+            executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            with executor_class(max_workers=workers) as executor:
+                # map() yields results in submission order, keeping the merge deterministic
+                results = list(executor.map(_parse_safely, paths))
+        return [(path, quotes, error) for path, (quotes, error) in zip(paths, results)]
+
+    @classmethod
+    def parse_many(cls, sources: Union[str, Iterable[str]], workers: Optional[int] = None,
+                   use_processes: bool = False) -> List[QuoteModel]:
+        """
+        Parses many files concurrently and merges their quotes.
+
+        Files that fail to parse are reported and skipped.
+
+        Args:
+            sources (str or iterable): Files, directories or glob patterns,
+                                       see `discover`.
+            workers (int): Pool size. Defaults to the executor's default.
+            use_processes (bool): Use a process pool instead of threads.
+
+        Returns:
+            List[QuoteModel]: The quotes of all files, in `discover` order.
+        """
+        quotes = []
+        for path, parsed, error in cls.parse_each(cls.discover(sources), workers, use_processes):
+            if error:
+                logger.error("Could not parse %s: %s", path, error)
+            quotes.extend(parsed)
+        return quotes
@@ -3,7 +3,7 @@ Defines the abstract base class for quote ingestors.
 """
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, List
 from .QuoteModel import QuoteModel
 
 
@@ -44,3 +44,20 @@ class IngestorInterface(ABC):
             List[QuoteModel]: A list of QuoteModel objects extracted from the file.
         """
         pass
+
+    @classmethod
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Parses the specified file, yielding quotes as they are read.
+
+        Concrete ingestors override this to stream their input so that
+        arbitrarily large files are processed in constant memory. The
+        default implementation falls back to `parse`.
+
+        Args:
+            path (str): The full path to the file to be parsed.
+
+        Yields:
+            QuoteModel: Each quote extracted from the file.
+        """
+        yield from cls.parse(path)
@@ -2,28 +2,50 @@
 Ingestor for pdf files (.pdf) extension
 """
 
+import atexit
+import importlib.util
+import logging
 import subprocess
 import shutil # To check for pdftotext executable
-from typing import List
+from typing import Iterable, Iterator, List, Optional
 from .IngestorInterface import IngestorInterface
+from .PdftotextPool import PdftotextPool
 from .QuoteModel import QuoteModel
-import os 
+import os
+
+logger = logging.getLogger(__name__)
+
+# pypdf is optional and imported on first use. To install: pip install pypdf
+PYPDF_AVAILABLE = importlib.util.find_spec('pypdf') is not None
+
 
 class PDFIngestor(IngestorInterface):
     """
-    Concrete ingestor for PDF files using Xpdf's pdftotext.
+    Concrete ingestor for PDF files.
+
+    Text is extracted by one of two backends and parsed for quotes in the
+    format '"body" - Author' or 'body - Author':
 
-    It extracts text from PDF files using the 'pdftotext' command-line tool
-    and attempts to parse quotes in the format '"body" - Author' or 'body - Author'.
-    Requires 'pdftotext' to be installed and accessible in the system's PATH.
+    * 'pdftotext' runs Xpdf's or Poppler's `pdftotext -layout` through a
+      `PdftotextPool` of long-lived shells, so Python starts no process per
+      file. It must be installed and on the system's PATH.
+    * 'pypdf' extracts text in-process with the pure-Python `pypdf`
+      library, so no process is started per file.
+
+    The default, 'auto', uses pypdf when it is installed and pdftotext
+    otherwise. Set `PDFIngestor.backend` or the QUOTE_PDF_BACKEND
+    environment variable to choose one explicitly.
     """
 
     allowed_extensions = ['pdf']
+    backends = ('auto', 'pypdf', 'pdftotext')
+    backend = os.environ.get('QUOTE_PDF_BACKEND', 'auto')
+    pool: Optional[PdftotextPool] = None  # Created on first use of pdftotext
 
     @classmethod
     def parse(cls, path: str) -> List[QuoteModel]:
         """
-        Parses a .pdf file and extracts quotes using pdftotext.
+        Parses a .pdf file and extracts quotes.
 
         Args:
             path (str): The path to the .pdf file.
@@ -32,54 +54,143 @@ class PDFIngestor(IngestorInterface):
             List[QuoteModel]: A list of QuoteModel objects.
 
         Raises:
-            Exception: If 'pdftotext' is not found or for other parsing errors.
+            Exception: If no backend is available or for other parsing errors.
+        """
+        return list(cls.iter_parse(path))
+
+    @classmethod
+    def resolve_backend(cls, backend: Optional[str] = None) -> str:
+        """
+        Returns the concrete backend to use.
+
+        Args:
+            backend (str): 'auto', 'pypdf' or 'pdftotext'. Defaults to
+                           `PDFIngestor.backend`.
+
+        Returns:
+            str: 'pypdf' or 'pdftotext'.
+
+        Raises:
+            ValueError: If the backend name is unknown.
+        """
+        backend = (backend or cls.backend).lower()
+        if backend not in cls.backends:
+            raise ValueError(f"Unknown PDF backend '{backend}'. "
+                             f"Expected one of: {', '.join(cls.backends)}")
+        if backend == 'auto':
+            return 'pypdf' if PYPDF_AVAILABLE else 'pdftotext'
+        return backend
+
+    @classmethod
+    def iter_parse(cls, path: str, backend: Optional[str] = None) -> Iterator[QuoteModel]:
+        """
+        Parses a .pdf file, yielding quotes as the text is extracted.
+
+        Args:
+            path (str): The path to the .pdf file.
+            backend (str): 'auto', 'pypdf' or 'pdftotext'. Defaults to
+                           `PDFIngestor.backend`.
+
+        Yields:
+            QuoteModel: Each quote in the document.
+
+        Raises:
+            Exception: If the backend is not available or for other parsing errors.
         """
         if not cls.can_ingest(path):
             raise Exception(f"Cannot ingest file type for {path}. Expected .pdf")
 
+        backend = cls.resolve_backend(backend)
+        cls._check_backend(backend)
+
+        if not os.path.exists(path):
+            raise Exception(f"Error: PDF file not found at {path}")
+
+        if backend == 'pypdf':
+            yield from cls._iter_pypdf(path)
+        else:
+            yield from cls._iter_pdftotext(path)
+
+    @classmethod
+    def pdftotext_pool(cls) -> PdftotextPool:
+        """
+        Returns the shared pool of pdftotext workers, creating it on first use.
+        """
+        if cls.pool is None:
+            cls.pool = PdftotextPool()
+            atexit.register(cls.pool.close)
+        return cls.pool
+
+    @staticmethod
+    def _check_backend(backend: str) -> None:
+        """
+        Raises if the chosen backend is not installed.
+        """
+        if backend == 'pypdf' and not PYPDF_AVAILABLE:
+            raise ImportError(
+                "The 'pypdf' library is not installed. "
+                "Please install it using 'pip install pypdf' to enable in-process PDF ingestion."
+            )
         # Check if pdftotext is available in the system's PATH
-        if shutil.which("pdftotext") is None:
+        if backend == 'pdftotext' and shutil.which("pdftotext") is None:
             raise Exception(
                 "The 'pdftotext' command-line tool is not found. "
                 "Please install Xpdf or Poppler utilities and ensure 'pdftotext' "
                 "is in your system's PATH to enable PDF ingestion."
             )
 
-        quotes = []
-        try:
-            # Execute pdftotext to extract text from the PDF
-            # -layout preserves original layout, which can be helpful for quotes
-            # - means output to stdout
-            command = ['pdftotext', '-layout', path, '-']
-            result = subprocess.run(command, capture_output=True, text=True, check=True)
-            text_content = result.stdout
-
-            # Process the extracted text line by line
-            for line in text_content.splitlines():
-                line = line.strip()
-                if not line:  # Skip empty lines
-                    continue
-
-                # Attempt to parse quotes in the format "body" - Author or body - Author
-                if ' - ' in line:
-                    parts = line.split(' - ', 1)
-                    body = parts[0].strip().strip('"') # Remove leading/trailing quotes from body
-                    author = parts[1].strip()
-                    if body and author:
-                        quotes.append(QuoteModel(body, author))
-                    else:
-                        print(f"Warning: Skipped malformed line in {path} (body or author missing): '{line}'")
-                # else:
-                    # Optional: Uncomment the line below for debugging if many lines are skipped
-                    # print(f"Debug: Skipped line in {path} due to missing ' - ' separator: '{line}'")
+    @staticmethod
+    def _parse_lines(path: str, lines: Iterable[str]) -> Iterator[QuoteModel]:
+        """
+        Yields the quotes found in lines of extracted text.
+        """
+        for line in lines:
+            line = line.strip()
+            if not line:  # Skip empty lines
+                continue
 
+            # Attempt to parse quotes in the format "body" - Author or body - Author
+            if ' - ' in line:
+                parts = line.split(' - ', 1)
+                body = parts[0].strip().strip('"') # Remove leading/trailing quotes from body
+                author = parts[1].strip()
+                if body and author:
+                    yield QuoteModel(body, author)
+                else:
+                    logger.warning("Skipped malformed line in %s (body or author missing): '%s'", path, line)
+            # else:
+                # Optional: Uncomment the line below for debugging if many lines are skipped
+                # logger.debug("Skipped line in %s due to missing ' - ' separator: '%s'", path, line)
+
+    @classmethod
+    def _iter_pypdf(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Extracts text in-process with pypdf, one page at a time.
+        """
+        from pypdf import PdfReader
+
+        try:
+            reader = PdfReader(path)
+            for page in reader.pages:
+                # Layout mode keeps each visual line together, like pdftotext -layout
+                yield from cls._parse_lines(path, page.extract_text(extraction_mode='layout')
+                                            .splitlines())
         except FileNotFoundError:
-            # This error occurs if the PDF file itself is not found
             raise Exception(f"Error: PDF file not found at {path}")
+        except Exception as e:
+            raise Exception(f"An unexpected error occurred while parsing {path}: {e}")
+
+    @classmethod
+    def _iter_pdftotext(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Extracts text with pdftotext on a pooled worker, consuming its output
+        line by line while it is still writing.
+        """
+        try:
+            yield from cls._parse_lines(path, cls.pdftotext_pool().iter_lines(path))
         except subprocess.CalledProcessError as e:
             # This error occurs if pdftotext command fails (e.g., corrupt PDF)
             raise Exception(f"Error running pdftotext on {path}: {e.stderr}")
         except Exception as e:
             # Catch any other unexpected errors during parsing
             raise Exception(f"An unexpected error occurred while parsing {path}: {e}")
-        return quotes
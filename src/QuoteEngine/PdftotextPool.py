@@ -0,0 +1,176 @@
+"""
+Persistent shells that run pdftotext for the PDF ingestor.
+"""
+
+import os
+import subprocess
+import tempfile
+import threading
+import uuid
+from typing import Iterator, List, Optional
+
+# Reads one path per line and runs pdftotext on it. Each file's text is
+# followed by a separator line carrying pdftotext's exit status; warnings go
+# to the worker's own file, which is removed when the shell exits (also when
+# its owner dies and stdin is closed).
+WORKER_SCRIPT = ('sep=$1; err=$2; trap \'rm -f "$err"\' EXIT; '
+                 'while IFS= read -r f; do '
+                 'pdftotext -layout "$f" - </dev/null 2>"$err"; '
+                 'printf "\\n%s %d\\n" "$sep" $?; '
+                 'done')
+
+
+class _Worker:
+    """
+    One long-lived shell and the file its pdftotext warnings are written to.
+    """
+
+    def __init__(self):
+        fd, self.errors_path = tempfile.mkstemp(prefix='pdftotext-', suffix='.err')
+        os.close(fd)
+        self.separator = f"--pdftotext-{uuid.uuid4().hex}--".encode('ascii')
+        self.process = subprocess.Popen(
+            ['sh', '-c', WORKER_SCRIPT, 'sh', self.separator, self.errors_path],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def errors(self) -> str:
+        """ Warnings written by the last pdftotext run """
+        try:
+            with open(self.errors_path, 'rb') as f:
+                return f.read().decode('utf-8', 'replace')
+        except OSError:
+            return ''
+
+    def close(self) -> None:
+        """ Ends the shell; it removes its warnings file on exit """
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        self.process.stdin.close()
+        self.process.stdout.close()
+        try:
+            os.remove(self.errors_path)
+        except FileNotFoundError:
+            pass
+
+
+class PdftotextPool:
+    """
+    A bounded pool of shells that extract PDF text with pdftotext.
+
+    pdftotext accepts a single input file per run, so each file still
+    starts one pdftotext process. The pool removes the rest of the per-file
+    cost: Python never forks for a file, it writes the path to a shell
+    that is already running and reads the text back from its stdout. Up to
+    `size` files are extracted in parallel, one per worker; callers beyond
+    that wait for a free worker.
+
+    A worker whose file was not read to the end (the consumer stopped
+    early, or the shell died) is discarded rather than reused. A pool
+    inherited through fork is not shared with the parent: the child starts
+    its own workers on first use.
+    """
+
+    def __init__(self, size: Optional[int] = None):
+        """
+        Initializes an empty pool; workers are started on demand.
+
+        Args:
+            size (int): Maximum number of workers. Defaults to the CPU count.
+        """
+        self.size = size or os.cpu_count() or 1
+        self._reset()
+
+    def _reset(self) -> None:
+        """ Forgets all workers; used at start and after a fork """
+        self._pid = os.getpid()
+        self._idle: List[_Worker] = []
+        self._started = 0
+        self._available = threading.Condition()
+
+    def _checkout(self) -> _Worker:
+        """ Takes an idle worker, starting one if the pool is not full """
+        if self._pid != os.getpid():
+            self._reset()
+        with self._available:
+            while not self._idle and self._started >= self.size:
+                self._available.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._started += 1
+        try:
+            return _Worker()
+        except BaseException:
+            with self._available:
+                self._started -= 1
+                self._available.notify()
+            raise
+
+    def _checkin(self, worker: _Worker, reusable: bool) -> None:
+        """ Returns a worker to the pool, or closes it """
+        if self._pid != os.getpid():
+            return
+        if not reusable:
+            worker.close()
+        with self._available:
+            if reusable:
+                self._idle.append(worker)
+            else:
+                self._started -= 1
+            self._available.notify()
+
+    def iter_lines(self, path: str) -> Iterator[str]:
+        """
+        Extracts the text of a PDF, yielding lines as pdftotext writes them.
+
+        Args:
+            path (str): The PDF file.
+
+        Yields:
+            str: Each line of text. Bytes that are not valid UTF-8 are replaced.
+
+        Raises:
+            subprocess.CalledProcessError: If pdftotext fails; `stderr` holds
+                                           its warnings.
+            Exception: If the path cannot be passed to a worker or the
+                       worker exits unexpectedly.
+        """
+        # An absolute path cannot be mistaken for an option
+        encoded = os.fsencode(os.path.abspath(path))
+        if b'\n' in encoded:
+            raise Exception(f"Cannot pass a path containing a newline to pdftotext: {path!r}")
+
+        worker = self._checkout()
+        finished = False
+        try:
+            worker.process.stdin.write(encoded + b'\n')
+            worker.process.stdin.flush()
+            status = None
+            for line in worker.process.stdout:
+                if line.startswith(worker.separator):
+                    status = int(line[len(worker.separator):])
+                    break
+                yield line.decode('utf-8', 'replace')
+            if status is None:
+                raise Exception("pdftotext worker exited unexpectedly")
+            finished = True
+            if status != 0:
+                raise subprocess.CalledProcessError(
+                    status, ['pdftotext', '-layout', path, '-'], stderr=worker.errors())
+        except BrokenPipeError:
+            raise Exception("pdftotext worker exited unexpectedly")
+        finally:
+            self._checkin(worker, finished)
+
+    def close(self) -> None:
+        """
+        Ends the idle workers.
+        """
+        if self._pid != os.getpid():
+            return
+        with self._available:
+            idle, self._idle = self._idle, []
+            self._started -= len(idle)
+            self._available.notify_all()
+        for worker in idle:
+            worker.close()
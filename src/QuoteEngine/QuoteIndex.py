@@ -0,0 +1,132 @@
+"""
+Inverted author and keyword index over a QuoteStore.
+"""
+
+import random
+import re
+from array import array
+from typing import Optional, Sequence, Set, Tuple
+
+from .QuoteModel import QuoteModel
+
+# Words are runs of letters, digits and underscores, compared case-insensitively
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class QuoteIndex:
+    """
+    Maps authors and body words to the ids of the quotes containing them.
+
+    A filtered random pick is then a posting-list lookup plus (for several
+    filters) an intersection instead of a scan over every quote. Authors
+    and words are matched case-insensitively; a multi-word keyword
+    matches quotes containing all of its words.
+
+    The posting lists are built at ingest time: `QuoteStore.save` writes
+    them into the compiled corpus, and over a `MappedQuoteStore` the index
+    reads them in place through the mapping. Creating an index over a
+    mapped corpus therefore does no work and adds no memory per process.
+    Over an in-memory `QuoteStore` the posting lists are built on creation.
+    """
+
+    def __init__(self, store):
+        """
+        Creates the index.
+
+        Args:
+            store (QuoteStore): The quotes to index. A MappedQuoteStore
+                                supplies its compiled posting lists.
+        """
+        self.store = store
+        mapped = getattr(store, 'author_postings', None)
+        if mapped is not None:
+            self._by_author, self._by_token = mapped, store.token_postings
+        else:
+            self._by_author, self._by_token = self.build_postings(store)
+
+    @classmethod
+    def build_postings(cls, store) -> Tuple[dict, dict]:
+        """
+        Builds the author and word posting lists of a store.
+
+        Args:
+            store (QuoteStore): The quotes to index.
+
+        Returns:
+            tuple: Dicts mapping each case-folded author, and each word, to
+                   an ascending array('I') of quote ids.
+        """
+        by_author = {}
+        by_token = {}
+        for quote_id in range(len(store)):
+            author = store.author(quote_id).casefold()
+            by_author.setdefault(author, array('I')).append(quote_id)
+            for token in cls.tokenize(store.body(quote_id)):
+                by_token.setdefault(token, array('I')).append(quote_id)
+        return by_author, by_token
+
+    @staticmethod
+    def tokenize(text: str) -> Set[str]:
+        """
+        Splits text into its distinct, case-folded words.
+
+        Args:
+            text (str): The text to split.
+
+        Returns:
+            set: The words.
+        """
+        return set(TOKEN_PATTERN.findall(text.casefold()))
+
+    def ids(self, author: Optional[str] = None, keyword: Optional[str] = None) -> Sequence[int]:
+        """
+        Returns the ids of the quotes matching every given filter.
+
+        Args:
+            author (str): Only quotes by this author.
+            keyword (str): Only quotes whose body contains all of these words.
+
+        Returns:
+            Sequence[int]: Matching quote ids in ascending order; every id
+                           when no filter is given.
+        """
+        postings = []
+        if author:
+            postings.append(self._by_author.get(author.strip().casefold(), ()))
+        if keyword:
+            tokens = self.tokenize(keyword)
+            if not tokens:
+                return ()
+            postings.extend(self._by_token.get(token, ()) for token in tokens)
+
+        if not postings:
+            return range(len(self.store))
+        if len(postings) == 1:
+            return postings[0]
+
+        # Intersect starting from the shortest posting list
+        postings.sort(key=len)
+        matches = set(postings[0])
+        for posting in postings[1:]:
+            matches.intersection_update(posting)
+            if not matches:
+                break
+        return sorted(matches)
+
+    def random(self, author: Optional[str] = None, keyword: Optional[str] = None,
+               rng=random) -> Optional[QuoteModel]:
+        """
+        Picks a random quote matching the filters.
+
+        Args:
+            author (str): Only quotes by this author.
+            keyword (str): Only quotes whose body contains all of these words.
+            rng: Source of randomness with a `randrange` method.
+
+        Returns:
+            QuoteModel: The chosen quote, or None if nothing matches.
+        """
+        ids = self.ids(author, keyword)
+        if not len(ids):
+            return None
+        return self.store[ids[rng.randrange(len(ids))]]
@@ -2,11 +2,20 @@
 Contains the QuoteModel class for encapsulating quote body and author.
 """
 
+import sys
+
+
 class QuoteModel:
     """
     Represents a single quote with a body and an author.
+
+    Instances use `__slots__` instead of a per-instance `__dict__`, and
+    author names are interned so every quote by the same author shares
+    one string object.
     """
 
+    __slots__ = ('body', 'author')
+
     def __init__(self, body: str, author: str):
         """
         Initializes a new QuoteModel instance.
@@ -16,7 +25,7 @@ class QuoteModel:
             author (str): The author of the quote.
         """
         self.body = body
-        self.author = author
+        self.author = sys.intern(author) if type(author) is str else author
 
     def __repr__(self) -> str:
         """
@@ -0,0 +1,392 @@
+"""
+Compact, array-backed container for large numbers of quotes.
+"""
+
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Iterable, List, Optional
+
+from .CorpusCache import CACHE_VERSION, CorpusCache
+from .QuoteIndex import QuoteIndex
+from .QuoteModel import QuoteModel
+
+# Compiled corpus layout, all integers in native byte order:
+#   header   magic, quote count, author count, metadata length, bodies length
+#   metadata JSON: byte order, ingestor output version and source fingerprints
+#   offsets  uint64 x (quotes + 1), body i spans offsets[i]:offsets[i + 1]
+#   refs     uint32 x quotes, index of each quote's author
+#   authors  uint64 x (authors + 1) offsets, followed by the author text
+#   bodies   UTF-8 text of every body, back to back
+#   postings the QuoteIndex posting tables, by author and then by word
+# Sections start on 8-byte boundaries so they can be viewed in place.
+CORPUS_MAGIC = b'QCORPUS2'
+CORPUS_HEADER = struct.Struct('=8sQQQQ')
+
+# Posting table layout: header (key count, key text length, id count),
+# uint64 x (keys + 1) key offsets, uint64 x (keys + 1) id offsets, the
+# uint32 quote ids, then the UTF-8 keys in sorted byte order.
+POSTINGS_HEADER = struct.Struct('=QQQ')
+
+
+def _pad(length: int) -> bytes:
+    """ Returns the zero bytes that align `length` to 8 bytes. """
+    return b'\0' * (-length % 8)
+
+
+def _pack_postings(postings: dict) -> List[bytes]:
+    """
+    Serializes a {key: array('I') of ids} mapping as a posting table.
+    """
+    keys = sorted((key.encode('utf-8'), key) for key in postings)
+    key_offsets = array('Q', [0])
+    id_offsets = array('Q', [0])
+    key_blob = bytearray()
+    ids = array('I')
+    for encoded, key in keys:
+        key_blob += encoded
+        key_offsets.append(len(key_blob))
+        ids.extend(postings[key])
+        id_offsets.append(len(ids))
+    return [POSTINGS_HEADER.pack(len(keys), len(key_blob), len(ids)),
+            key_offsets.tobytes(), id_offsets.tobytes(),
+            ids.tobytes(), _pad(len(ids) * 4),
+            bytes(key_blob), _pad(len(key_blob))]
+
+
+class MappedPostings:
+    """
+    Read-only view of a posting table inside a mapped corpus.
+
+    Keys are found by binary search over the sorted key text, and id
+    lists are returned as views into the mapping, so nothing is loaded
+    until it is looked up.
+    """
+
+    def __init__(self, view: memoryview):
+        """
+        Views the posting table at the start of `view`.
+
+        Args:
+            view (memoryview): The mapping, starting at the table.
+        """
+        keys, key_length, ids = POSTINGS_HEADER.unpack_from(view)
+        position = POSTINGS_HEADER.size
+        self._key_offsets = view[position:position + (keys + 1) * 8].cast('Q')
+        position += (keys + 1) * 8
+        self._id_offsets = view[position:position + (keys + 1) * 8].cast('Q')
+        position += (keys + 1) * 8
+        self._ids = view[position:position + ids * 4].cast('I')
+        position += ids * 4 + len(_pad(ids * 4))
+        self._keys = view[position:position + key_length]
+        self.size = position + key_length + len(_pad(key_length))
+
+    def __len__(self) -> int:
+        return len(self._key_offsets) - 1
+
+    def get(self, key: str, default=()):
+        """
+        Returns the ids listed under `key`, or `default`.
+        """
+        target = key.encode('utf-8')
+        low, high = 0, len(self) - 1
+        while low <= high:
+            middle = (low + high) // 2
+            candidate = bytes(self._keys[self._key_offsets[middle]:self._key_offsets[middle + 1]])
+            if candidate < target:
+                low = middle + 1
+            elif candidate > target:
+                high = middle - 1
+            else:
+                return self._ids[self._id_offsets[middle]:self._id_offsets[middle + 1]]
+        return default
+
+    def release(self) -> None:
+        """
+        Releases the views into the mapping.
+        """
+        for view in (self._key_offsets, self._id_offsets, self._ids, self._keys):
+            view.release()
+
+
+class QuoteStore(Sequence):
+    """
+    Stores quotes in contiguous buffers instead of one object per quote.
+
+    Bodies are concatenated into a single UTF-8 buffer addressed through an
+    offset array, and each author is stored once in an author table that
+    quotes reference by index. A QuoteModel is only created when a quote
+    is read, so memory use stays close to the size of the text itself.
+
+    The store is a read-only `Sequence`: it supports `len`, indexing,
+    iteration and `random.choice`, and `random()` picks a quote in O(1).
+    """
+
+    def __init__(self, quotes: Iterable[QuoteModel] = ()):
+        """
+        Initializes the store, optionally filling it with quotes.
+
+        Args:
+            quotes (iterable): QuoteModel objects to add.
+        """
+        self._bodies = bytearray()
+        self._offsets = array('Q', [0])  # Body i spans _offsets[i]:_offsets[i + 1]
+        self._author_refs = array('I')   # Index into _authors for each quote
+        self._authors = []
+        self._author_index = {}
+        self.extend(quotes)
+
+    def add(self, body: str, author: str) -> None:
+        """
+        Appends a quote.
+
+        Args:
+            body (str): The main text of the quote.
+            author (str): The author of the quote.
+        """
+        author_ref = self._author_index.get(author)
+        if author_ref is None:
+            author_ref = self._author_index[author] = len(self._authors)
+            self._authors.append(author)
+
+        self._bodies += body.encode('utf-8')
+        self._offsets.append(len(self._bodies))
+        self._author_refs.append(author_ref)
+
+    def append(self, quote: QuoteModel) -> None:
+        """
+        Appends a QuoteModel.
+        """
+        self.add(quote.body, quote.author)
+
+    def extend(self, quotes: Iterable[QuoteModel]) -> None:
+        """
+        Appends every QuoteModel from an iterable.
+        """
+        for quote in quotes:
+            self.add(quote.body, quote.author)
+
+    @property
+    def authors(self) -> list:
+        """ The distinct authors, in order of first appearance. """
+        return list(self._authors)
+
+    def body(self, index: int) -> str:
+        """
+        Returns the body of the quote at `index` without building a QuoteModel.
+        """
+        if index < 0:
+            index += len(self)
+        return str(self._bodies[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+
+    def author(self, index: int) -> str:
+        """
+        Returns the author of the quote at `index` without building a QuoteModel.
+        """
+        return self._authors[self._author_refs[index]]
+
+    def random(self, rng=random) -> QuoteModel:
+        """
+        Picks a quote uniformly at random in constant time.
+
+        Args:
+            rng: Source of randomness with a `randrange` method. Defaults to
+                 the `random` module.
+
+        Returns:
+            QuoteModel: The chosen quote.
+
+        Raises:
+            IndexError: If the store is empty.
+        """
+        if not len(self):
+            raise IndexError("Cannot pick a quote from an empty QuoteStore")
+        return self[rng.randrange(len(self))]
+
+    def __len__(self) -> int:
+        return len(self._author_refs)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("QuoteStore index out of range")
+        return QuoteModel(self.body(index), self.author(index))
+
+    def save(self, path: str, sources: Optional[dict] = None) -> None:
+        """
+        Writes the store as a compiled corpus file for `MappedQuoteStore`.
+
+        The `QuoteIndex` posting lists are computed here and stored in the
+        file, so processes that map the corpus get the index for free.
+        The file is written under a temporary name and renamed into place,
+        so processes that have the old file mapped keep a consistent view.
+
+        Args:
+            path (str): The corpus file to write.
+            sources (dict): Source file fingerprints to record, used to
+                            detect when the corpus is out of date.
+        """
+        meta = json.dumps({'byteorder': sys.byteorder,
+                           'cache_version': CACHE_VERSION,
+                           'sources': sources or {}}).encode('utf-8')
+        author_offsets = array('Q', [0])
+        author_blob = bytearray()
+        for author in self._authors:
+            author_blob += author.encode('utf-8')
+            author_offsets.append(len(author_blob))
+
+        by_author, by_token = QuoteIndex.build_postings(self)
+        sections = [
+            CORPUS_HEADER.pack(CORPUS_MAGIC, len(self), len(self._authors), len(meta),
+                               len(self._bodies)),
+            meta, _pad(len(meta)),
+            self._offsets.tobytes(),
+            self._author_refs.tobytes(), _pad(len(self._author_refs) * 4),
+            author_offsets.tobytes(), bytes(author_blob), _pad(len(author_blob)),
+            bytes(self._bodies), _pad(len(self._bodies)),
+            *_pack_postings(by_author),
+            *_pack_postings(by_token),
+        ]
+
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            for section in sections:
+                f.write(section)
+        os.replace(temp_path, path)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} quotes, {len(self._authors)} authors)"
+
+
+class MappedQuoteStore(QuoteStore):
+    """
+    Read-only QuoteStore backed by a memory-mapped corpus file.
+
+    Opening the file only reads its header and author table; bodies,
+    offsets and the compiled index are viewed in place through the mapping. Pages are shared by
+    every process that maps the same file, so each worker's memory no
+    longer grows with the size of the corpus.
+    """
+
+    def __init__(self, path: str):
+        """
+        Maps a corpus file written by `QuoteStore.save`.
+
+        Args:
+            path (str): The corpus file.
+
+        Raises:
+            ValueError: If the file is not a compatible corpus.
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+
+        magic, quotes, authors, meta_length, bodies_length = CORPUS_HEADER.unpack_from(view)
+        position = CORPUS_HEADER.size
+        if magic != CORPUS_MAGIC:
+            raise ValueError(f"{path} is not a compiled quote corpus")
+        meta = json.loads(str(view[position:position + meta_length], 'utf-8'))
+        if meta['byteorder'] != sys.byteorder:
+            raise ValueError(f"{path} was compiled on a machine with another byte order")
+        self.sources = meta['sources']
+        # Quotes parsed by an older version of the ingestors may differ
+        self.cache_version = meta.get('cache_version')
+        position += meta_length + len(_pad(meta_length))
+
+        self._offsets = view[position:position + (quotes + 1) * 8].cast('Q')
+        position += (quotes + 1) * 8
+        self._author_refs = view[position:position + quotes * 4].cast('I')
+        position += quotes * 4 + len(_pad(quotes * 4))
+        author_offsets = view[position:position + (authors + 1) * 8].cast('Q')
+        position += (authors + 1) * 8
+        self._authors = [
+            sys.intern(str(view[position + author_offsets[i]:position + author_offsets[i + 1]],
+                           'utf-8'))
+            for i in range(authors)
+        ]
+        self._author_index = {author: i for i, author in enumerate(self._authors)}
+        position += author_offsets[authors] + len(_pad(author_offsets[authors]))
+        self._bodies = view[position:position + bodies_length]
+        position += bodies_length + len(_pad(bodies_length))
+        # Posting lists for QuoteIndex, compiled when the corpus was built
+        self.author_postings = MappedPostings(view[position:])
+        position += self.author_postings.size
+        self.token_postings = MappedPostings(view[position:])
+
+    def add(self, body: str, author: str) -> None:
+        """
+        Not supported; compiled corpora are read-only.
+
+        Raises:
+            TypeError: Always.
+        """
+        raise TypeError("MappedQuoteStore is read-only; rebuild the corpus instead")
+
+    def close(self) -> None:
+        """
+        Releases the memory mapping. The store is unusable afterwards.
+        """
+        for view in (self._offsets, self._author_refs, self._bodies):
+            view.release()
+        self.author_postings.release()
+        self.token_postings.release()
+        self._mmap.close()
+
+    @staticmethod
+    def fingerprints(paths: List[str]) -> dict:
+        """
+        Returns the (size, mtime) fingerprints of the existing source files.
+        """
+        fingerprints = {}
+        for path in paths:
+            if os.path.exists(path):
+                fingerprints[os.path.abspath(path)] = list(CorpusCache.fingerprint(path))
+        return fingerprints
+
+    @classmethod
+    def open_or_build(cls, paths: List[str], corpus_path: str,
+                      cache: Optional[CorpusCache] = None) -> 'MappedQuoteStore':
+        """
+        Maps a corpus of the given source files, compiling it first if needed.
+
+        The corpus is rebuilt when any source file was added, removed or
+        modified since it was compiled, or when it was compiled with another
+        `CACHE_VERSION` (i.e. another version of the ingestors). Sources that fail to parse are
+        left out of the recorded fingerprints, so they are retried on the
+        next start.
+
+        Args:
+            paths (list): Quote source files.
+            corpus_path (str): The compiled corpus file.
+            cache (CorpusCache): Parsed-quote cache used when rebuilding, so
+                                 only changed sources are parsed again.
+
+        Returns:
+            MappedQuoteStore: The mapped corpus.
+        """
+        fingerprints = cls.fingerprints(paths)
+        try:
+            store = cls(corpus_path)
+            if store.sources == fingerprints and store.cache_version == CACHE_VERSION:
+                return store
+            store.close()
+        except (OSError, ValueError, struct.error):
+            pass
+
+        if cache is None:
+            cache = CorpusCache(corpus_path + '.cache.pickle')
+        quotes = cache.load(paths)
+        for path in cache.failed:
+            fingerprints.pop(os.path.abspath(path), None)
+        QuoteStore(quotes).save(corpus_path, fingerprints)
+        return cls(corpus_path)
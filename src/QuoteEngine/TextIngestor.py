@@ -2,10 +2,13 @@
 Ingestor for plain text (.txt) files.
 """
 
-from typing import List
+import logging
+from typing import Iterator, List
 from .IngestorInterface import IngestorInterface
 from .QuoteModel import QuoteModel
 
+logger = logging.getLogger(__name__)
+
 
 class TextIngestor(IngestorInterface):
     """
@@ -30,10 +33,22 @@ class TextIngestor(IngestorInterface):
         Raises:
             Exception: If the file cannot be opened or read.
         """
+        return list(cls.iter_parse(path))
+
+    @classmethod
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Parses a .txt file line by line, yielding quotes as they are read.
+
+        Args:
+            path (str): The path to the .txt file.
+
+        Yields:
+            QuoteModel: Each quote in the file.
+        """
         if not cls.can_ingest(path):
             raise Exception(f"Cannot ingest file type for {path}. Expected .txt")
 
-        quotes = []
         try:
             with open(path, 'r', encoding='utf-8') as file:
                 for line in file:
@@ -46,15 +61,14 @@ class TextIngestor(IngestorInterface):
                         body = parts[0].strip().strip('"')  # Remove potential surrounding quotes
                         author = parts[1].strip()
                         if body and author: # Ensure both parts are non-empty
-                            quotes.append(QuoteModel(body, author))
+                            yield QuoteModel(body, author)
                         else:
-                            print(f"Warning: Skipped malformed line in {path}: '{line}' (body or author missing)")
+                            logger.warning("Skipped malformed line in %s: '%s' (body or author missing)", path, line)
                     else:
-                        print(f"Warning: Skipped line in {path} due to missing ' - ' separator: '{line}'")
+                        logger.warning("Skipped line in %s due to missing ' - ' separator: '%s'", path, line)
         except FileNotFoundError:
-            print(f"Error: File not found at {path}")
+            logger.error("File not found at %s", path)
         except PermissionError:
-            print(f"Error: Permission denied when trying to read {path}")
+            logger.error("Permission denied when trying to read %s", path)
         except Exception as e:
-            print(f"An unexpected error occurred while parsing {path}: {e}")
-        return quotes
+            logger.error("An unexpected error occurred while parsing %s: %s", path, e)
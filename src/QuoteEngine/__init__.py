@@ -3,6 +3,9 @@ QuoteEngine package for ingesting and parsing various quote file types.
 """
 from .QuoteModel import QuoteModel
 from .Ingestor import Ingestor
+from .CorpusCache import CorpusCache
+from .QuoteStore import QuoteStore, MappedQuoteStore
+from .QuoteIndex import QuoteIndex
 
 # Define what gets imported when someone does `from QuoteEngine import *`
-__all__ = ['QuoteModel', 'Ingestor']
+__all__ = ['QuoteModel', 'Ingestor', 'CorpusCache', 'QuoteStore', 'MappedQuoteStore', 'QuoteIndex']
@@ -0,0 +1,91 @@
+"""
+Polling file watcher used to hot-reload quote and image sources.
+"""
+
+import os
+import threading
+from typing import Callable, Dict, List
+
+
+class SourceWatcher(threading.Thread):
+    """
+    Background thread that reports files added, modified or removed.
+
+    The watched directories are scanned every `interval` seconds and each
+    file's (size, mtime) is compared with the previous scan. Polling keeps
+    the watcher dependency-free and portable; for directories of quote
+    files and photos a scan costs a few stat calls.
+    """
+
+    def __init__(self, directories: List[str], on_change: Callable[[Dict[str, List[str]]], None],
+                 interval: float = 2.0):
+        """
+        Initializes the watcher and takes the initial snapshot.
+
+        Args:
+            directories (list): Directories to watch recursively.
+            on_change (callable): Called from the watcher thread with a dict
+                                  of 'added', 'modified' and 'removed' paths
+                                  whenever a scan finds differences.
+            interval (float): Seconds between scans. Defaults to 2.
+        """
+        super().__init__(name='source-watcher', daemon=True)
+        self.directories = directories
+        self.on_change = on_change
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._snapshot = self.scan()
+
+    def scan(self) -> Dict[str, tuple]:
+        """
+        Fingerprints every file under the watched directories.
+
+        Returns:
+            dict: Maps file path to its (size, mtime) fingerprint.
+        """
+        snapshot = {}
+        for directory in self.directories:
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def poll(self) -> Dict[str, List[str]]:
+        """
+        Scans once and returns the differences from the previous scan.
+
+        Returns:
+            dict: Sorted 'added', 'modified' and 'removed' path lists.
+        """
+        snapshot = self.scan()
+        previous = self._snapshot
+        self._snapshot = snapshot
+        return {
+            'added': sorted(snapshot.keys() - previous.keys()),
+            'modified': sorted(path for path in snapshot.keys() & previous.keys()
+                               if snapshot[path] != previous[path]),
+            'removed': sorted(previous.keys() - snapshot.keys()),
+        }
+
+    def run(self) -> None:
+        """
+        Polls until `stop` is called, reporting changes to `on_change`.
+        """
+        while not self._stop_event.wait(self.interval):
+            changes = self.poll()
+            if any(changes.values()):
+                try:
+                    self.on_change(changes)
+                except Exception as e:
+                    print(f"Warning: Reloading sources failed: {e}")
+
+    def stop(self) -> None:
+        """
+        Stops the watcher after the current scan.
+        """
+        self._stop_event.set()
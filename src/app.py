@@ -1,45 +1,195 @@
 import random
 import os
+import logging
+import multiprocessing
+from typing import NamedTuple, Optional
 import requests
-from flask import Flask, render_template, abort, request
-import tempfile
+from flask import Flask, render_template, abort, request, url_for, Response, make_response, jsonify
+from PIL import features
 
 
 # @TODO Import your Ingestor and MemeEngine classes
 
-from MemeEngine import MemeEngine
-from QuoteEngine import Ingestor,QuoteModel
+from MemeEngine import MemeEngine, Encoder
+from MemeEngine.ImageFetcher import ImageFetcher, ImageFetchError
+from MemeEngine.MemeStore import MemeStore
+from MemeEngine.RemoteImageCache import RemoteImageCache
+from MemeEngine.RenderScheduler import RenderScheduler, SchedulerBusy
+from MemeEngine.Warmup import start_warm_up
+from QuoteEngine import Ingestor,QuoteModel,CorpusCache,MappedQuoteStore,QuoteIndex
+from FileLock import FileLock
+from SourceWatcher import SourceWatcher
 
 import os 
 
 
 app = Flask(__name__)
 
-# Initialize MemeEngine with the static output directory
-meme = MemeEngine('./static')
+# Show the quote engine's progress and warnings, unless the server already
+# configured logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+# Initialize MemeEngine with the static output directory. The default output
+# format and quality can be set with MEME_OUTPUT_FORMAT (png, jpeg or webp)
+# and MEME_OUTPUT_QUALITY. With MEME_PYRAMID=1, photos are decoded from a
+# pre-generated size pyramid in ./_cache/pyramid instead of full size.
+meme = MemeEngine('./static', encoder=Encoder(
+    os.environ.get('MEME_OUTPUT_FORMAT', 'png'),
+    quality=int(os.environ.get('MEME_OUTPUT_QUALITY', '85'))),
+    pyramid_dir='./_cache/pyramid' if os.environ.get('MEME_PYRAMID') == '1' else None)
+
+# Serve WebP to browsers that explicitly accept it, if Pillow can encode it
+webp_encoder = meme.encoder.replace('webp') if features.check('webp') else None
+
+# Shared fetcher for /create: pooled connections, timeouts and a size cap.
+# Fetched images are kept on disk as resized bitmaps, keyed by URL, so
+# popular URLs skip both the download and the decode.
+fetcher = ImageFetcher()
+remote_images = RemoteImageCache(fetcher)
+
+# With MEME_IN_MEMORY=1 memes are never written to ./static; they are kept
+# in a bounded in-memory store and served by the meme_image route instead.
+meme_store = MemeStore() if os.environ.get('MEME_IN_MEMORY') == '1' else None
+
+
+# The helpers below hold the route logic shared with app_async.py, which
+# only differs in how requests wait and how replies are sent.
+
+def choose_encoder(accept_mimetypes):
+    """ Pick the output encoder from the request's parsed Accept header """
+    # Only an explicit image/webp entry counts; */* does not imply WebP support
+    if webp_encoder is not None and any(
+            mimetype == 'image/webp' and quality > 0
+            for mimetype, quality in accept_mimetypes):
+        return webp_encoder
+    return meme.encoder
+
+
+class MemeJob(NamedTuple):
+    """ Where a meme is served from, and the render still needed for it """
+    path: Optional[str]      # Output file, when memes are written to ./static
+    meme_id: Optional[str]   # MemeStore ID, with MEME_IN_MEMORY=1
+    render: Optional[dict]   # Keyword arguments for meme.make_meme, or None if done
+    mimetype: str
+
+
+def plan_meme(img_path, body, author, encoder):
+    """ Work out a meme's file or in-memory ID and whether it must be rendered """
+    name = meme.output_name(img_path, body, author, encoder=encoder)
+    render = {'img_path': img_path, 'text': body, 'author': author, 'encoder': encoder}
+    if meme_store is None:
+        # Memes that already exist are served without taking a queue slot
+        path = os.path.join(meme.output_dir, name)
+        return MemeJob(path, None, None if os.path.exists(path) else render, encoder.mimetype)
+
+    # The content-addressed name doubles as the in-memory ID, so repeated
+    # requests for the same meme are served without rendering again.
+    meme_id = os.path.splitext(name)[0]
+    return MemeJob(None, meme_id, None if meme_id in meme_store else dict(render, as_bytes=True),
+                   encoder.mimetype)
+
+
+def finish_meme(job, result):
+    """ Keep a rendered meme in the in-memory store, if memes live there """
+    if job.meme_id is not None:
+        meme_store.put(job.meme_id, result, job.mimetype)
+
+
+def make_meme_url(img_path, body, author):
+    """ Render a meme and return the URL the template should load it from """
+    job = plan_meme(img_path, body, author, choose_encoder(request.accept_mimetypes))
+    if job.render is not None:
+        finish_meme(job, scheduler.run(meme.make_meme, **job.render))
+    return job.path or url_for('meme_image', meme_id=job.meme_id)
+
+
+def busy_reply(error):
+    """ 503 telling the client when to retry, for a full render queue """
+    return (f"Server busy: {error}. Please retry shortly.", 503,
+            {'Retry-After': str(error.retry_after)})
+
+
+def pooled_meme(filtered):
+    """ A pre-rendered meme from the warm-up pool for unfiltered picks, or None """
+    if meme_pool is not None and not filtered:
+        return meme_pool.choice()
+    return None
+
+
+def pick_random(current, author_filter=None, keyword=None):
+    """ Choose the image and quote for a random meme
+
+    Returns (img, quote, None), or (None, None, (message, status)) when
+    there is nothing to pick from.
+    """
+    if current.imgs:
+        img = random.choice(current.imgs)
+    else:
+        print("No images available for random meme generation.")
+        # Fallback to a placeholder if no images are found
+        img = os.path.join(os.path.dirname(__file__), '_data')
+        if not os.path.exists(img):
+            return None, None, ("Error: No images to generate random meme.", 500)
+
+    if author_filter or keyword:
+        quote = current.quote_index.random(author_filter, keyword)
+        if quote is None:
+            return None, None, ("No quotes match the given author or keyword.", 404)
+    elif current.quotes:
+        quote = current.quotes.random()
+    else:
+        print("No quotes available for random meme generation.")
+        # Fallback to a default quote
+        quote = QuoteModel("No quotes found!", "Admin")
+    return img, quote, None
 
 
-def setup():
-    """ Load all resources """
+def render_meme_page(path):
+    """ Render the meme page; its image format depends on the Accept header """
+    response = make_response(render_template('meme.html', path=path))
+    response.vary.add('Accept')
+    return response
 
-    quote_files = ['./_data/DogQuotes/DogQuotesTXT.txt',
-                   './_data/DogQuotes/DogQuotesDOCX.docx',
-                   './_data/DogQuotes/DogQuotesPDF.pdf',
-                   './_data/DogQuotes/DogQuotesCSV.csv']
 
-    quotes = []
-    for f in quote_files:
-        try:
-            quotes.extend(Ingestor.parse(f))
-        except Exception as e:
-            print(f"Could not parse {f}: {e}")
+QUOTES_DIR = './_data/DogQuotes'
+# Lock files coordinating start-up work between server worker processes
+LOCKS_DIR = './_cache/locks'
+IMAGES_DIR = './_data/photos'
+IMAGE_EXTENSIONS = ('.jpg', '.png', '.jpeg')
+
+quote_files = ['./_data/DogQuotes/DogQuotesTXT.txt',
+               './_data/DogQuotes/DogQuotesDOCX.docx',
+               './_data/DogQuotes/DogQuotesPDF.pdf',
+               './_data/DogQuotes/DogQuotesCSV.csv']
+
+
+class Resources(NamedTuple):
+    """ Quote and image tables served by the routes, swapped as one unit """
+    quotes: MappedQuoteStore
+    quote_index: QuoteIndex
+    imgs: list
 
+
+def load_quotes():
+    """ Load the quotes of every file in quote_files """
+    # Quotes are served from a compiled, memory-mapped corpus shared by all
+    # worker processes. It is rebuilt only when a quote file changes, and
+    # then unchanged files still come from the parsed-quote cache. Workers
+    # take turns, so one compiles a changed corpus and the rest map it.
+    with FileLock(os.path.join(LOCKS_DIR, 'corpus.lock')):
+        return MappedQuoteStore.open_or_build(
+            quote_files, os.path.join(QUOTES_DIR, 'quotes.corpus'),
+            CorpusCache(os.path.join(QUOTES_DIR, '.quotes_cache.pickle')))
+
+
+def load_images():
+    """ Collect the dog photos """
     images_path = "./_data/photos/dog/"
     imgs = []
     if os.path.exists(images_path):
         for root, dirs, files in os.walk(images_path):
             for file in files:
-                if file.endswith(('.jpg', '.png', '.jpeg')):
+                if file.endswith(IMAGE_EXTENSIONS):
                     imgs.append(os.path.join(root, file))
     else:
         print(f"Warning: Image directory not found: {images_path}")
@@ -50,48 +200,174 @@ def setup():
             imgs.append(placeholder_img)
         else:
             print("Error: No images found and no fallback placeholder available.")
+    return imgs
 
 
-    return quotes, imgs
+def build_pyramid(imgs):
+    """ Generate pyramid levels for new or edited photos, one worker at a time """
+    # The first worker builds the levels; the others re-read its index, so
+    # every worker decodes from the same levels
+    with FileLock(os.path.join(LOCKS_DIR, 'pyramid.lock')):
+        meme.image_cache.pyramid.build(imgs)
+
+
+def setup():
+    """ Load all resources """
+    return load_quotes(), load_images()
 
 
 quotes, imgs = setup()
 
+# Author and keyword index for filtered picks on '/'. Its posting lists are
+# compiled into the mapped corpus, so this reads nothing up front. Routes
+# read all three tables through this one global, so a reload replaces them
+# atomically.
+resources = Resources(quotes, QuoteIndex(quotes), imgs)
+
+# Levels are only generated for new or edited photos
+if meme.image_cache.pyramid is not None and multiprocessing.parent_process() is None:
+    build_pyramid(imgs)
+
+# Optional warm-up: pre-render the random meme space on a background process
+# pool so '/' can serve finished files. Enable with MEME_WARMUP=1; the pool
+# size is capped by MEME_WARMUP_LIMIT and MEME_WARMUP_WORKERS sets the
+# number of processes. Only one server worker renders the pool: the one
+# holding the warm-up lock, which is released when it exits. The other
+# workers render on demand and reuse any meme the pool already wrote.
+# The pool is made of files in ./static, so it is skipped with MEME_IN_MEMORY=1.
+# It is started before the render scheduler and the source watcher, so its
+# processes are forked while this process has no other threads.
+meme_pool = None
+warmup_lock = FileLock(os.path.join(LOCKS_DIR, 'warmup.lock'))
+if (os.environ.get('MEME_WARMUP') == '1' and meme_store is None
+        and multiprocessing.parent_process() is None and warmup_lock.acquire(blocking=False)):
+    warmup_workers = os.environ.get('MEME_WARMUP_WORKERS')
+    meme_pool = start_warm_up(
+        meme, imgs, quotes,
+        limit=int(os.environ.get('MEME_WARMUP_LIMIT', '200')),
+        workers=int(warmup_workers) if warmup_workers else None)
+
+# Renders run on a fixed pool of MEME_RENDER_WORKERS threads (default: CPU
+# count) behind a queue of MEME_RENDER_QUEUE renders. Requests that find the
+# queue full, or wait longer than MEME_RENDER_TIMEOUT seconds, get a 503.
+render_workers = os.environ.get('MEME_RENDER_WORKERS')
+scheduler = RenderScheduler(
+    workers=int(render_workers) if render_workers else None,
+    max_queue=int(os.environ.get('MEME_RENDER_QUEUE', '32')),
+    timeout=float(os.environ.get('MEME_RENDER_TIMEOUT', '10')))
+
+
+def reload_sources(changes):
+    """ Apply file changes reported by the SourceWatcher """
+    global resources, quote_files
+
+    changed = [path for paths in changes.values() for path in paths]
+    quotes_dir = os.path.abspath(QUOTES_DIR)
+    quote_changes = [path for path in changed
+                     if os.path.dirname(os.path.abspath(path)) == quotes_dir
+                     and Ingestor.can_ingest(path)]
+    image_changes = [os.path.abspath(path) for path in changed
+                     if path.endswith(IMAGE_EXTENSIONS)]
+    if not quote_changes and not image_changes:
+        return
+
+    current = resources
+    quotes, quote_index, imgs = current
+
+    if quote_changes:
+        # New quote files are picked up, deleted ones dropped; the corpus
+        # cache re-parses only the files that actually changed.
+        removed = {os.path.abspath(path) for path in changes['removed']}
+        known = {os.path.abspath(path) for path in quote_files}
+        quote_files = ([path for path in quote_files if os.path.abspath(path) not in removed]
+                       + [path for path in changes['added']
+                          if path in quote_changes and os.path.abspath(path) not in known])
+        quotes = load_quotes()
+        quote_index = QuoteIndex(quotes)
+
+    if image_changes:
+        imgs = load_images()
+        if meme.image_cache.pyramid is not None:
+            build_pyramid(imgs)
+        for path in image_changes:
+            meme.image_cache.evict(path)
+
+    # The old store is left mapped; requests still holding it finish normally
+    resources = Resources(quotes, quote_index, imgs)
+    print(f"Reloaded sources: {len(quotes)} quotes, {len(imgs)} images")
+
+    if meme_pool is not None:
+        stale_images = set(image_changes)
+        live_quotes = ({(quote.body, quote.author) for quote in quotes}
+                       if quote_changes else None)
+        meme_pool.discard(lambda job: os.path.abspath(job[0]) in stale_images
+                          or (live_quotes is not None and tuple(job[1:]) not in live_quotes))
+
+
+# Optional hot reload: with MEME_WATCH=1 the quote and photo directories are
+# polled every MEME_WATCH_INTERVAL seconds and changes are applied without
+# a restart. Every server worker runs its own watcher on purpose: each
+# holds its own quote and image tables, which only it can swap. The work
+# behind a reload is still done once, since the corpus and pyramid locks
+# let the first worker rebuild and the others map the result.
+source_watcher = None
+if os.environ.get('MEME_WATCH') == '1' and multiprocessing.parent_process() is None:
+    source_watcher = SourceWatcher([QUOTES_DIR, IMAGES_DIR], reload_sources,
+                                   interval=float(os.environ.get('MEME_WATCH_INTERVAL', '2')))
+    source_watcher.start()
+
 
 @app.route('/')
 def meme_rand():
     """ Generate a random meme """
 
-    img = None
-    if imgs:
-        img = random.choice(imgs)
-    else:
-        print("No images available for random meme generation.")
-        # Fallback to a placeholder if no images are found
-        img = os.path.join(os.path.dirname(__file__), '_data')
-        if not os.path.exists(img):
-            return "Error: No images to generate random meme.", 500
+    # Optional filters, e.g. /?author=Rex or /?keyword=bork
+    author_filter = request.args.get('author')
+    keyword = request.args.get('keyword')
 
-    quote = None
-    if quotes:
-        quote = random.choice(quotes)
-    else:
-        print("No quotes available for random meme generation.")
-        # Fallback to a default quote
-        quote = QuoteModel("No quotes found!", "Admin")
+    pooled_path = pooled_meme(bool(author_filter or keyword))
+    if pooled_path:
+        return render_template('meme.html', path=pooled_path)
+
+    img, quote, error = pick_random(resources, author_filter, keyword)
+    if error:
+        return error
 
-    path = meme.make_meme(img, quote.body, quote.author)
+    try:
+        path = make_meme_url(img, quote.body, quote.author)
+    except SchedulerBusy as e:
+        return busy_reply(e)
     if path:
         # Flask expects paths relative to 'static' for url_for,
         # but here we're passing a direct file path.
         # We need to strip the 'static/' part for the template.
         #display_path = path.replace('static/', '')
         display_path = path
-        return render_template('meme.html', path=display_path)
+        return render_meme_page(display_path)
     else:
         return "Error generating random meme.", 500
 
 
+@app.route('/memes/<meme_id>')
+def meme_image(meme_id):
+    """ Serve a meme from the in-memory store """
+    entry = meme_store.get(meme_id) if meme_store is not None else None
+    if entry is None:
+        abort(404)
+    data, mimetype = entry
+    return Response(data, mimetype=mimetype,
+                    headers={'Cache-Control': f'private, max-age={int(meme_store.ttl)}'})
+
+
+@app.route('/metrics')
+def metrics():
+    """ Render queue depth, wait times and cache counters for monitoring """
+    return jsonify({'scheduler': scheduler.stats(),
+                    'image_cache': meme.image_cache.stats(),
+                    'text_layout': meme.text_layout.stats(),
+                    'remote_images': remote_images.stats()})
+
+
 @app.route('/create', methods=['GET'])
 def meme_form():
     """ User input for meme information """
@@ -108,37 +384,28 @@ def meme_post():
     if not image_url:
         return "Image URL is required.", 400
 
-    temp_img_path = None
     path = None
 
     try:
-        response = requests.get(image_url, stream=True)
-        response.raise_for_status() # Raise an exception for HTTP errors
-
-        # Create a temporary file to save the image
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as temp_file:
-            for chunk in response.iter_content(chunk_size=8192):
-                temp_file.write(chunk)
-            temp_img_path = temp_file.name
-
-        path = meme.make_meme(temp_img_path, body, author)
+        # Downloaded into memory and decoded from there, never via a temp file.
+        # Decoding and resizing run on the render pool, like the render itself.
+        image = remote_images.get(image_url, run=scheduler.run)
+        path = make_meme_url(image, body, author)
 
-    except requests.exceptions.RequestException as e:
+    except ImageFetchError as e:
         print(f"Error downloading image: {e}")
         return f"Error downloading image: {e}", 400
+    except SchedulerBusy as e:
+        return busy_reply(e)
     except Exception as e:
         print(f"Error creating meme: {e}")
         return f"Error creating meme: {e}", 500
-    finally:
-        # Remove the temporary saved image
-        if temp_img_path and os.path.exists(temp_img_path):
-            os.remove(temp_img_path)
 
     if path:
         #display_path = path.replace('static/', '')
         print(path)
         display_path = path
-        return render_template('meme.html', path=display_path)
+        return render_meme_page(display_path)
     else:
         return "Error creating user-defined meme.", 500
 
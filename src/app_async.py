@@ -0,0 +1,307 @@
+"""
+Asynchronous ASGI entry point serving the same routes as app.py.
+
+Run it with any ASGI server from the src directory, e.g.
+
+    uvicorn app_async:app --workers 4
+
+Importing `app` loads the quotes, photos, engine, render scheduler and
+caches, so both entry points share the same state and configuration
+(MEME_OUTPUT_FORMAT, MEME_IN_MEMORY, MEME_RENDER_WORKERS, ...). The route
+logic (picking the image and quote, the encoder, where a meme is served
+from, error replies) comes from the helpers in app.py as well.
+
+What differs is how a request waits. Remote images for /create are
+downloaded with an `AsyncImageFetcher`, so a slow image host holds a
+coroutine rather than a server thread, and renders are handed to the
+render scheduler and awaited without blocking the event loop. Everything
+CPU-bound (decoding, captioning, encoding) runs on the scheduler's
+threads and cache file access on the default executor, never on the loop.
+"""
+
+import asyncio
+import json
+import mimetypes
+import os
+from typing import Optional
+from urllib.parse import parse_qs
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+import app as sync_app
+from MemeEngine.AsyncImageFetcher import AsyncImageFetcher
+from MemeEngine.ImageFetcher import ImageFetchError
+from MemeEngine.RenderScheduler import SchedulerBusy
+
+STATIC_DIR = './static'
+
+# Largest accepted /create form body; the form holds a URL and two short fields
+MAX_FORM_BYTES = 64 * 1024
+
+ROUTE_URLS = {
+    'meme_rand': '/',
+    'meme_form': '/create',
+    'meme_post': '/create',
+    'meme_image': '/memes/{meme_id}',
+}
+
+
+def url_for(endpoint, **values):
+    """ Minimal stand-in for Flask's url_for, covering the templates' routes """
+    return ROUTE_URLS[endpoint].format(**values)
+
+
+templates = Environment(loader=FileSystemLoader(os.path.join(os.path.dirname(__file__), 'templates')),
+                        autoescape=select_autoescape(['html']))
+templates.globals['url_for'] = url_for
+
+# Created on first use, so the client belongs to the server's event loop
+fetcher: Optional[AsyncImageFetcher] = None
+
+
+def get_fetcher():
+    """ Return the shared async fetcher, creating it on first use """
+    global fetcher
+    if fetcher is None:
+        fetcher = AsyncImageFetcher()
+    return fetcher
+
+
+class Response:
+    """ Status, headers and body of a reply """
+
+    def __init__(self, body, status=200, content_type='text/html; charset=utf-8', headers=None):
+        self.body = body.encode('utf-8') if isinstance(body, str) else body
+        self.status = status
+        self.headers = [(b'content-type', content_type.encode('latin-1'))]
+        for name, value in (headers or {}).items():
+            self.headers.append((name.lower().encode('latin-1'), str(value).encode('latin-1')))
+
+    async def send(self, send, head=False):
+        """ Write the reply through the ASGI send callable; HEAD gets no body """
+        await send({'type': 'http.response.start', 'status': self.status,
+                    'headers': self.headers + [(b'content-length', str(len(self.body)).encode())]})
+        await send({'type': 'http.response.body', 'body': b'' if head else self.body})
+
+
+async def schedule(fn, *args, **kwargs):
+    """ Run `fn` on the scheduler's render pool and await it without blocking the loop """
+    scheduler = sync_app.scheduler
+    future = scheduler.submit(fn, *args, **kwargs)
+    try:
+        await asyncio.wait({asyncio.wrap_future(future)}, timeout=scheduler.timeout)
+    finally:
+        # A render that has not started yet is dropped by the worker; this
+        # also covers the request itself being cancelled
+        future.cancel()
+    # Cancelled: the deadline passed while the render was still queued
+    if future.cancelled() or not future.done():
+        raise SchedulerBusy(f"Render did not finish within {scheduler.timeout:g}s",
+                            scheduler.retry_after())
+    return future.result()
+
+
+async def make_meme_url(img_path, body, author, headers):
+    """ Render a meme and return the URL the template should load it from """
+    encoder = sync_app.choose_encoder(parse_accept_header(headers.get('accept'), MIMEAccept))
+    # Naming a meme hashes its source (all the pixels, for a downloaded
+    # image) and checks for an existing file, so it runs off the loop too
+    job = await asyncio.get_running_loop().run_in_executor(
+        None, sync_app.plan_meme, img_path, body, author, encoder)
+    if job.render is not None:
+        sync_app.finish_meme(job, await schedule(sync_app.meme.make_meme, **job.render))
+    return job.path or url_for('meme_image', meme_id=job.meme_id)
+
+
+def busy_response(error):
+    """ 503 telling the client when to retry, for a full render queue """
+    body, status, headers = sync_app.busy_reply(error)
+    return Response(body, status, headers=headers)
+
+
+def render_meme_page(path):
+    """ Render the meme page; its image format depends on the Accept header """
+    return Response(templates.get_template('meme.html').render(path=path),
+                    headers={'Vary': 'Accept'})
+
+
+async def meme_rand(query, headers):
+    """ Generate a random meme """
+    author_filter = query.get('author', [None])[0]
+    keyword = query.get('keyword', [None])[0]
+
+    pooled_path = sync_app.pooled_meme(bool(author_filter or keyword))
+    if pooled_path:
+        return Response(templates.get_template('meme.html').render(path=pooled_path))
+
+    img, quote, error = sync_app.pick_random(sync_app.resources, author_filter, keyword)
+    if error:
+        return Response(*error)
+
+    try:
+        path = await make_meme_url(img, quote.body, quote.author, headers)
+    except SchedulerBusy as e:
+        return busy_response(e)
+    if path:
+        return render_meme_page(path)
+    return Response("Error generating random meme.", 500)
+
+
+async def meme_image(meme_id):
+    """ Serve a meme from the in-memory store """
+    meme_store = sync_app.meme_store
+    entry = meme_store.get(meme_id) if meme_store is not None else None
+    if entry is None:
+        return Response("Not Found", 404)
+    data, mimetype = entry
+    return Response(data, content_type=mimetype,
+                    headers={'Cache-Control': f'private, max-age={int(meme_store.ttl)}'})
+
+
+async def metrics():
+    """ Render queue depth, wait times and cache counters for monitoring """
+    return Response(json.dumps({'scheduler': sync_app.scheduler.stats(),
+                                'image_cache': sync_app.meme.image_cache.stats(),
+                                'text_layout': sync_app.meme.text_layout.stats(),
+                                'remote_images': sync_app.remote_images.stats()}),
+                    content_type='application/json')
+
+
+async def meme_form():
+    """ User input for meme information """
+    return Response(templates.get_template('meme_form.html').render())
+
+
+async def meme_post(form, headers):
+    """ Create a user defined meme """
+    image_url = form.get('image_url', [None])[0]
+    body = form.get('body', [None])[0]
+    author = form.get('author', [None])[0]
+
+    if not image_url:
+        return Response("Image URL is required.", 400)
+
+    try:
+        # Only the download is awaited on the loop; decode and resize run on
+        # the render pool
+        image = await sync_app.remote_images.get_async(image_url, get_fetcher(), run=schedule)
+        path = await make_meme_url(image, body, author, headers)
+    except ImageFetchError as e:
+        print(f"Error downloading image: {e}")
+        return Response(f"Error downloading image: {e}", 400)
+    except SchedulerBusy as e:
+        return busy_response(e)
+    except Exception as e:
+        print(f"Error creating meme: {e}")
+        return Response(f"Error creating meme: {e}", 500)
+
+    if path:
+        return render_meme_page(path)
+    return Response("Error creating user-defined meme.", 500)
+
+
+def read_static(name):
+    """ Read a generated meme from the static directory, or None """
+    path = os.path.join(STATIC_DIR, name)
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+async def static_file(name):
+    """ Serve a file from ./static, as Flask does for the sync app """
+    # Only plain file names; the directory holds nothing else
+    if not name or name != os.path.basename(name) or name.startswith('.'):
+        return Response("Not Found", 404)
+    data = await asyncio.get_running_loop().run_in_executor(None, read_static, name)
+    if data is None:
+        return Response("Not Found", 404)
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    return Response(data, content_type=content_type)
+
+
+async def read_body(receive, limit):
+    """ Read the request body, or return None if it is larger than `limit` """
+    body = bytearray()
+    while True:
+        message = await receive()
+        body.extend(message.get('body', b''))
+        if len(body) > limit:
+            return None
+        if not message.get('more_body'):
+            return bytes(body)
+
+
+async def lifespan(receive, send):
+    """ Close the pooled connections when the server shuts down """
+    global fetcher
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if fetcher is not None:
+                await fetcher.aclose()
+                fetcher = None
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+def allowed_methods(path):
+    """ Methods a path accepts, or None if no route matches it """
+    if path == '/create':
+        return ('GET', 'HEAD', 'OPTIONS', 'POST')
+    if path in ('/', '/metrics') or path.startswith(('/memes/', '/static/')):
+        return ('GET', 'HEAD', 'OPTIONS')
+    return None
+
+
+async def dispatch(scope, receive):
+    """ Route a request to its handler """
+    method = scope['method']
+    path = scope['path']
+    headers = {name.decode('latin-1').lower(): value.decode('latin-1')
+               for name, value in scope['headers']}
+
+    # A known path with the wrong method is a 405, as in Flask
+    allowed = allowed_methods(path)
+    if allowed is None:
+        return Response("Not Found", 404)
+    if method == 'OPTIONS':
+        return Response(b'', headers={'Allow': ', '.join(allowed)})
+    if method not in allowed:
+        return Response("Method Not Allowed", 405, headers={'Allow': ', '.join(allowed)})
+
+    if path == '/':
+        query = parse_qs(scope.get('query_string', b'').decode('latin-1'), keep_blank_values=True)
+        return await meme_rand(query, headers)
+    if path == '/create':
+        if method != 'POST':
+            return await meme_form()
+        body = await read_body(receive, MAX_FORM_BYTES)
+        if body is None:
+            return Response("Request body too large.", 413)
+        # Blank fields are kept as '', as Flask's request.form does
+        form = parse_qs(body.decode('utf-8', 'replace'), keep_blank_values=True)
+        return await meme_post(form, headers)
+    if path == '/metrics':
+        return await metrics()
+    if path.startswith('/memes/'):
+        return await meme_image(path[len('/memes/'):])
+    return await static_file(path[len('/static/'):])
+
+
+async def app(scope, receive, send):
+    """ ASGI application """
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    response = await dispatch(scope, receive)
+    await response.send(send, head=scope['method'] == 'HEAD')
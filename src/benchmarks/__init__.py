@@ -0,0 +1,4 @@
+"""
+Benchmarks for the meme generator, run from the src directory with
+`python -m benchmarks.<name>`.
+"""
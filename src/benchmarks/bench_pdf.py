@@ -0,0 +1,84 @@
+"""
+Compares the PDF text extraction backends of PDFIngestor.
+
+Run from the src directory:
+
+    python -m benchmarks.bench_pdf --repeat 200
+
+Each bundled PDF is parsed `repeat` times with the in-process pypdf
+backend, with the pdftotext backend (a pool of long-lived shells), and
+with one pdftotext process started from Python per file, which is how
+the subprocess backend used to work.
+"""
+
+import argparse
+import logging
+import shutil
+import statistics
+import subprocess
+import time
+
+from QuoteEngine.PDFIngestor import PDFIngestor, PYPDF_AVAILABLE
+
+PDF_FILES = ['./_data/DogQuotes/DogQuotesPDF.pdf',
+             './_data/SimpleLines/SimpleLines.pdf']
+
+
+def backend_runner(backend):
+    """ Returns a runner that parses each file with a PDFIngestor backend """
+    def run(paths):
+        return sum(len(list(PDFIngestor.iter_parse(path, backend))) for path in paths)
+    return run
+
+
+def process_per_file(paths):
+    """ Parses each file with its own pdftotext process, as a baseline """
+    quotes = 0
+    for path in paths:
+        output = subprocess.run(['pdftotext', '-layout', path, '-'], capture_output=True,
+                                check=True).stdout.decode('utf-8', 'replace')
+        quotes += len(list(PDFIngestor._parse_lines(path, output.splitlines())))
+    return quotes
+
+
+def measure(run, paths, rounds):
+    """ Times `rounds` runs, returning (median seconds, quotes parsed) """
+    timings = []
+    quotes = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        quotes = run(paths)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), quotes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF ingestion backends")
+    parser.add_argument('--repeat', type=int, default=50,
+                        help='times each bundled PDF is parsed per round')
+    parser.add_argument('--rounds', type=int, default=5, help='timed rounds per backend')
+    args = parser.parse_args()
+    # Ingestor warnings are not part of the measurement
+    logging.disable(logging.WARNING)
+
+    paths = PDF_FILES * args.repeat
+    candidates = []
+    if PYPDF_AVAILABLE:
+        candidates.append(('pypdf (in-process)', backend_runner('pypdf')))
+    else:
+        print("Skipping pypdf: library not installed")
+    if shutil.which('pdftotext') is not None:
+        candidates.append(('pdftotext (process per file)', process_per_file))
+        candidates.append(('pdftotext (worker pool)', backend_runner('pdftotext')))
+    else:
+        print("Skipping pdftotext: command not found")
+
+    print(f"{len(paths)} files, median of {args.rounds} rounds")
+    for name, run in candidates:
+        seconds, quotes = measure(run, paths, args.rounds)
+        print(f"{name:<30} {seconds * 1000:9.1f} ms  "
+              f"{seconds / len(paths) * 1e6:8.0f} us/file  {quotes} quotes")
+
+
+if __name__ == '__main__':
+    main()
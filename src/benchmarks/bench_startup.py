@@ -0,0 +1,77 @@
+"""
+Measures import time of the packages and scripts against a startup budget.
+
+Run from the src directory:
+
+    python -m benchmarks.bench_startup --runs 5
+
+Each target is imported in a fresh interpreter with `python -X importtime`
+and the cumulative time of its top-level import is reported, median over
+`runs`. Importing `app` also opens the quote corpus, so build it once
+(by starting the app) before comparing numbers. The heavy optional
+dependencies loaded by each import are listed; with lazy ingestors none
+of pandas, python-docx or pypdf should appear.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Target module -> budget in milliseconds on a typical developer machine
+BUDGETS_MS = {
+    'QuoteEngine': 50,
+    'MemeEngine': 100,
+    'meme': 150,
+    'app': 400,
+}
+
+HEAVY_MODULES = ('pandas', 'docx', 'pypdf', 'requests', 'flask')
+
+
+def import_profile(module):
+    """ Imports `module` in a fresh interpreter, returning (ms, heavy modules loaded) """
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               capture_output=True, text=True, check=True)
+    total_us = None
+    loaded = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if not cumulative.strip().isdigit():
+            continue  # Header line
+        name = name.rstrip()
+        if name.strip() in HEAVY_MODULES:
+            loaded.add(name.strip())
+        if name == f' {module}':
+            total_us = int(cumulative)
+    return total_us / 1000, sorted(loaded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import time against a budget")
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters per target')
+    parser.add_argument('targets', nargs='*', default=list(BUDGETS_MS),
+                        help='modules to import; defaults to every budgeted module')
+    args = parser.parse_args()
+
+    over_budget = False
+    print(f"{'module':<12} {'median':>9} {'budget':>8}  heavy imports")
+    for module in args.targets:
+        profiles = [import_profile(module) for _ in range(args.runs)]
+        median_ms = statistics.median(ms for ms, _ in profiles)
+        budget = BUDGETS_MS.get(module)
+        status = ''
+        if budget is not None and median_ms > budget:
+            status = '  OVER BUDGET'
+            over_budget = True
+        budget_text = f"{budget} ms" if budget is not None else '-'
+        print(f"{module:<12} {median_ms:6.1f} ms {budget_text:>8}  "
+              f"{', '.join(profiles[-1][1]) or '-'}{status}")
+
+    raise SystemExit(1 if over_budget else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,508 @@
+"""
+Benchmark suite for the render, ingest and request hot paths.
+
+Run from the src directory:
+
+    python -m benchmarks.bench_suite --output results.json
+    python -m benchmarks.bench_suite --quick render ingest
+    python -m benchmarks.bench_suite --compare baseline.json --output results.json
+
+Sections (all by default):
+
+* `render`: single `MemeEngine.make_meme` latency percentiles per
+  synthetic source image size and output format, with a cold image
+  cache (decode on every render) and a warm one.
+* `throughput`: memes per second across N workers, both on threads
+  through `RenderScheduler` and on processes through `make_memes`.
+* `ingest`: parse time and peak memory per quote file format for
+  generated corpora of 1k to 1M quotes. Each measurement runs in a fresh
+  process, reporting its peak resident set size and the peak of Python
+  allocations traced during one parse.
+* `requests`: end-to-end latency of `/`, `GET /create` and `POST /create`
+  through Flask's test client, with remote images served by a local
+  image server.
+
+Inputs are generated with a fixed seed, so runs on one machine are
+comparable. Results are written as JSON together with the Python,
+platform and dependency versions; `--compare` prints the change of every
+median against an earlier result file, which is how an upgrade of
+Pillow, pandas or python-docx is checked for regressions. The 1M quote
+corpora take several minutes to build and parse (PDF most of all);
+`--quick` runs smaller sizes and fewer iterations.
+"""
+
+import argparse
+import contextlib
+import csv
+import datetime
+import io
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
+from multiprocessing import get_context
+from xml.sax.saxutils import escape
+
+from PIL import Image, features
+
+from MemeEngine import Encoder, MemeEngine, RenderScheduler
+
+SEED = 1234
+
+IMAGE_SIZES = [(640, 480), (1920, 1080), (4000, 3000)]
+INGEST_SIZES = [1000, 10000, 100000, 1000000]
+INGEST_FORMATS = ['txt', 'csv', 'docx', 'pdf']
+WORKER_COUNTS = [1, 2, 4, os.cpu_count() or 1]
+
+QUICK = {
+    'image_sizes': IMAGE_SIZES[:2],
+    'ingest_sizes': [1000, 10000],
+    'renders': 20,
+    'jobs': 40,
+    'requests': 30,
+    'repeat': 1,
+}
+FULL = {
+    'image_sizes': IMAGE_SIZES,
+    'ingest_sizes': INGEST_SIZES,
+    'renders': 100,
+    'jobs': 200,
+    'requests': 200,
+    'repeat': 3,
+}
+
+PACKAGES = ['Pillow', 'pandas', 'python-docx', 'pypdf', 'Flask', 'requests', 'httpx']
+
+WORDS = ('bork woof treat ball walk squirrel nap bone fetch mailman sofa bath '
+         'leash park stick belly rub zoomies bark sniff tail wag good boy').split()
+AUTHORS = [f"{name} {suffix}" for name in ('Rex', 'Fido', 'Bork', 'Skittle', 'Mr. Paws',
+                                            'Stinky', 'Luna', 'Biscuit')
+           for suffix in ('the Good', 'the Brave', 'Jr.', 'of the Park', 'Sr.')]
+
+
+def summarize(values):
+    """ Median, p95, p99, min and max of seconds, in milliseconds """
+    values = sorted(values)
+
+    def at(fraction):
+        return values[min(len(values) - 1, int(fraction * len(values)))]
+    return {
+        'count': len(values),
+        'median_ms': statistics.median(values) * 1000,
+        'p95_ms': at(0.95) * 1000,
+        'p99_ms': at(0.99) * 1000,
+        'min_ms': values[0] * 1000,
+        'max_ms': values[-1] * 1000,
+    }
+
+
+def generate_quotes(count, seed=SEED):
+    """ Deterministic (body, author) pairs of 3-15 words """
+    rng = random.Random(seed)
+    for index in range(count):
+        words = rng.choices(WORDS, k=rng.randint(3, 15))
+        yield f"{' '.join(words).capitalize()} {index}", rng.choice(AUTHORS)
+
+
+def generate_image(path, size, seed=SEED):
+    """ Write a photo-like JPEG: a gradient with noise, so encoders have real work """
+    gradient = Image.linear_gradient('L').resize(size)
+    noise = Image.effect_noise(size, 40)
+    rng = random.Random(seed)
+    channels = [Image.blend(gradient, noise, rng.uniform(0.2, 0.5)) for _ in range(3)]
+    Image.merge('RGB', channels).save(path, 'JPEG', quality=90)
+
+
+# ---------------------------------------------------------------- render
+
+
+def bench_render(workdir, options):
+    """ make_meme latency per image size, output format and cache state """
+    encoders = [Encoder('png'), Encoder('jpeg')]
+    if features.check('webp'):
+        encoders.append(Encoder('webp'))
+    quotes = list(generate_quotes(options['renders']))
+
+    results = []
+    for size in options['image_sizes']:
+        img_path = os.path.join(workdir, f"source_{size[0]}x{size[1]}.jpg")
+        generate_image(img_path, size)
+        for encoder in encoders:
+            for cache in ('cold', 'warm'):
+                engine = MemeEngine(workdir, image_cache_bytes=0 if cache == 'cold'
+                                    else 64 * 1024 * 1024, encoder=encoder)
+                engine.make_meme(img_path, 'warm up', 'bench', as_bytes=True)
+                timings = []
+                output_bytes = 0
+                for body, author in quotes:
+                    started = time.perf_counter()
+                    output_bytes = len(engine.make_meme(img_path, body, author, as_bytes=True))
+                    timings.append(time.perf_counter() - started)
+                results.append({'image_size': f"{size[0]}x{size[1]}",
+                                'format': encoder.output_format, 'cache': cache,
+                                'output_bytes': output_bytes, **summarize(timings)})
+                print(f"render   {size[0]:>4}x{size[1]:<4} {encoder.output_format:<5} {cache:<5} "
+                      f"median {results[-1]['median_ms']:7.1f} ms  p95 {results[-1]['p95_ms']:7.1f} ms")
+    return results
+
+
+# ------------------------------------------------------------ throughput
+
+
+def bench_throughput(workdir, options):
+    """ Memes per second across worker counts, on threads and on processes """
+    img_path = os.path.join(workdir, 'throughput_source.jpg')
+    generate_image(img_path, (1920, 1080))
+    worker_counts = sorted(set(WORKER_COUNTS))
+
+    results = []
+    for workers in worker_counts:
+        # Threads sharing one engine, as the web app renders
+        engine = MemeEngine(workdir)
+        engine.make_meme(img_path, 'warm up', 'bench', as_bytes=True)
+        scheduler = RenderScheduler(workers=workers, max_queue=options['jobs'], timeout=600)
+        quotes = list(generate_quotes(options['jobs'], seed=SEED + workers))
+        started = time.perf_counter()
+        futures = [scheduler.submit(engine.make_meme, img_path, body, author, as_bytes=True)
+                   for body, author in quotes]
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - started
+        results.append({'mode': 'threads', 'workers': workers, 'jobs': len(quotes),
+                        'seconds': elapsed, 'memes_per_second': len(quotes) / elapsed})
+
+        # Processes through make_memes, as meme.py --batch --workers renders.
+        # Each worker count writes to its own directory so no job finds an
+        # existing file.
+        output_dir = os.path.join(workdir, f"batch_{workers}")
+        os.makedirs(output_dir)
+        jobs = [(img_path, body, author)
+                for body, author in generate_quotes(options['jobs'], seed=SEED + 100 + workers)]
+        started = time.perf_counter()
+        failures = sum(result.error is not None
+                       for result in MemeEngine(output_dir).make_memes(jobs, workers=workers))
+        elapsed = time.perf_counter() - started
+        results.append({'mode': 'processes', 'workers': workers, 'jobs': len(jobs),
+                        'failures': failures, 'seconds': elapsed,
+                        'memes_per_second': len(jobs) / elapsed})
+
+        for result in results[-2:]:
+            print(f"workers  {result['mode']:<9} {workers:>3}  "
+                  f"{result['memes_per_second']:7.1f} memes/s")
+    return results
+
+
+# ---------------------------------------------------------------- ingest
+
+
+def write_txt(path, quotes):
+    """ One '"body" - author' line per quote """
+    with open(path, 'w', encoding='utf-8') as f:
+        for body, author in quotes:
+            f.write(f'"{body}" - {author}\n')
+
+
+def write_csv(path, quotes):
+    """ A body,author table with a header row """
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['body', 'author'])
+        writer.writerows(quotes)
+
+
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>')
+DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+    'relationships/officeDocument" Target="word/document.xml"/></Relationships>')
+
+
+def write_docx(path, quotes):
+    """ A minimal WordprocessingML package; python-docx opens it too """
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', DOCX_CONTENT_TYPES)
+        archive.writestr('_rels/.rels', DOCX_RELS)
+        with archive.open('word/document.xml', 'w') as part:
+            part.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                       b'<w:document xmlns:w="http://schemas.openxmlformats.org/'
+                       b'wordprocessingml/2006/main"><w:body>')
+            for body, author in quotes:
+                part.write(f'<w:p><w:r><w:t xml:space="preserve">"{escape(body)}" - '
+                           f'{escape(author)}</w:t></w:r></w:p>'.encode('utf-8'))
+            part.write(b'</w:body></w:document>')
+
+
+def write_pdf(path, quotes, lines_per_page=60):
+    """ A plain PDF with one quote per text line and a standard font """
+    def pdf_string(text):
+        return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+    quotes = list(quotes)
+    pages = [quotes[start:start + lines_per_page]
+             for start in range(0, len(quotes), lines_per_page)] or [[]]
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and its content per page
+    page_ids = [4 + 2 * index for index in range(len(pages))]
+    offsets = {}
+    with open(path, 'wb') as f:
+        def write_object(number, data):
+            offsets[number] = f.tell()
+            f.write(f"{number} 0 obj\n".encode('ascii') + data + b"\nendobj\n")
+
+        f.write(b"%PDF-1.4\n")
+        write_object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        kids = ' '.join(f"{page_id} 0 R" for page_id in page_ids)
+        write_object(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode('ascii'))
+        write_object(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+        for page_id, page in zip(page_ids, pages):
+            write_object(page_id, (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                                   f"/Resources << /Font << /F1 3 0 R >> >> "
+                                   f"/Contents {page_id + 1} 0 R >>").encode('ascii'))
+            lines = ''.join(f'({pdf_string(f"{body} - {author}")}) Tj T* '
+                            for body, author in page)
+            stream = f"BT /F1 9 Tf 12 TL 36 760 Td {lines}ET".encode('latin-1')
+            write_object(page_id + 1, f"<< /Length {len(stream)} >>\nstream\n".encode('ascii')
+                         + stream + b"\nendstream")
+
+        xref = f.tell()
+        count = 2 + 2 * len(pages) + 1
+        f.write(f"xref\n0 {count + 1}\n0000000000 65535 f \n".encode('ascii'))
+        for number in range(1, count + 1):
+            f.write(f"{offsets[number]:010d} 00000 n \n".encode('ascii'))
+        f.write(f"trailer\n<< /Size {count + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+                .encode('ascii'))
+
+
+WRITERS = {'txt': write_txt, 'csv': write_csv, 'docx': write_docx, 'pdf': write_pdf}
+
+
+def peak_rss_mb():
+    """ Peak resident set size of this process in MiB, or None if unknown """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _measure_ingest(path, repeat):
+    """
+    Runs in a fresh process: times `repeat` parses of `path`, then traces
+    the Python allocations of one more.
+    """
+    from QuoteEngine import Ingestor
+
+    Ingestor.ingestor_for_extension(os.path.splitext(path)[1][1:])
+    baseline = peak_rss_mb()
+    timings = []
+    quotes = 0
+    # Ingestor warnings are not part of the measurement
+    logging.disable(logging.WARNING)
+    for _ in range(repeat):
+        started = time.perf_counter()
+        quotes = len(Ingestor.parse(path))
+        timings.append(time.perf_counter() - started)
+    peak = peak_rss_mb()
+
+    # Traced separately, since tracing slows the parse down
+    tracemalloc.start()
+    Ingestor.parse(path)
+    traced_peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    tracemalloc.stop()
+    return timings, quotes, baseline, peak, traced_peak
+
+
+def bench_ingest(workdir, options):
+    """ Parse time and peak memory per format and corpus size """
+    from QuoteEngine.PDFIngestor import PDFIngestor
+
+    results = []
+    for size in options['ingest_sizes']:
+        for file_format in INGEST_FORMATS:
+            path = os.path.join(workdir, f"quotes_{size}.{file_format}")
+            WRITERS[file_format](path, generate_quotes(size))
+            # A fresh process per measurement keeps earlier parses out of the peak
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+                try:
+                    timings, quotes, baseline, peak, traced_peak = executor.submit(
+                        _measure_ingest, path, options['repeat']).result()
+                except Exception as e:
+                    print(f"ingest   {file_format:<5} {size:>8}  failed: {e}")
+                    results.append({'format': file_format, 'quotes': size, 'error': str(e)})
+                    continue
+            result = {'format': file_format, 'quotes': size, 'parsed': quotes,
+                      'file_bytes': os.path.getsize(path),
+                      'peak_rss_mb': peak, 'peak_rss_delta_mb': (
+                          peak - baseline if peak is not None else None),
+                      'peak_traced_mb': traced_peak,
+                      **summarize(timings)}
+            if file_format == 'pdf':
+                result['backend'] = PDFIngestor.resolve_backend()
+            results.append(result)
+            os.remove(path)
+            print(f"ingest   {file_format:<5} {size:>8}  median {result['median_ms']:9.1f} ms  "
+                  f"{traced_peak:8.1f} MiB traced peak")
+    return results
+
+
+# -------------------------------------------------------------- requests
+
+
+def bench_requests(workdir, options):
+    """ End-to-end latency of the web routes through Flask's test client """
+    from benchmarks.load_test import start_image_server
+    from MemeEngine.RemoteImageCache import RemoteImageCache
+
+    # The app's start-up output and the ingestors' progress are not part of
+    # the measurement
+    logging.disable(logging.INFO)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+    # Memes and fetched images go to the work directory, not ./static and
+    # ./_cache, which the server serves and keeps
+    app.meme.output_dir = os.path.join(workdir, 'static')
+    app.meme.config['output_dir'] = app.meme.output_dir
+    os.makedirs(app.meme.output_dir)
+    app.remote_images = RemoteImageCache(app.fetcher, cache_dir=os.path.join(workdir, 'remote'))
+    client = app.app.test_client()
+    image_server, image_base = start_image_server(0, size=(1920, 1080))
+    counter = iter(range(sys.maxsize))
+
+    cases = {
+        'GET /': lambda: client.get('/'),
+        'GET /create': lambda: client.get('/create'),
+        # The same cacheable URL every time: served from the remote image cache
+        'POST /create (cached image)': lambda: client.post('/create', data={
+            'image_url': f"{image_base}/cached/dog.jpg", 'body': f"Bench {next(counter)}",
+            'author': 'Bench'}),
+        # A new, uncacheable URL every time: downloaded and decoded on each request
+        'POST /create (new image)': lambda: client.post('/create', data={
+            'image_url': f"{image_base}/new.jpg?n={next(counter)}",
+            'body': f"Bench {next(counter)}", 'author': 'Bench'}),
+    }
+
+    results = []
+    try:
+        for name, request in cases.items():
+            timings = []
+            statuses = {}
+            with contextlib.redirect_stdout(io.StringIO()):
+                request()  # Warm up
+                for _ in range(options['requests']):
+                    started = time.perf_counter()
+                    status = request().status_code
+                    timings.append(time.perf_counter() - started)
+                    statuses[str(status)] = statuses.get(str(status), 0) + 1
+            results.append({'route': name, 'statuses': statuses, **summarize(timings)})
+            print(f"request  {name:<28} median {results[-1]['median_ms']:7.1f} ms  "
+                  f"p95 {results[-1]['p95_ms']:7.1f} ms  {statuses}")
+    finally:
+        image_server.shutdown()
+    return results
+
+
+SECTIONS = {
+    'render': bench_render,
+    'throughput': bench_throughput,
+    'ingest': bench_ingest,
+    'requests': bench_requests,
+}
+
+# Fields that identify one measurement within a section, for --compare
+KEYS = {
+    'render': ('image_size', 'format', 'cache'),
+    'throughput': ('mode', 'workers'),
+    'ingest': ('format', 'quotes'),
+    'requests': ('route',),
+}
+
+
+def environment():
+    """ Interpreter, machine and dependency versions of this run """
+    versions = {}
+    for package in PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'packages': versions,
+    }
+
+
+def compare(baseline, current):
+    """ Print the change of each comparable metric against a baseline run """
+    print(f"\nCompared with the run of {baseline['environment']['timestamp']}:")
+    for section, keys in KEYS.items():
+        old = {tuple(row.get(key) for key in keys): row for row in baseline.get(section, [])}
+        for row in current.get(section, []):
+            previous = old.get(tuple(row.get(key) for key in keys))
+            if previous is None:
+                continue
+            metric = 'memes_per_second' if section == 'throughput' else 'median_ms'
+            if not previous.get(metric) or metric not in row:
+                continue
+            change = (row[metric] - previous[metric]) / previous[metric] * 100
+            label = ' '.join(str(row[key]) for key in keys)
+            print(f"{section:<10} {label:<40} {previous[metric]:10.1f} -> "
+                  f"{row[metric]:10.1f} {metric}  ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rendering, ingestion and requests")
+    parser.add_argument('sections', nargs='*',
+                        help=f"sections to run, of {', '.join(SECTIONS)}; defaults to all")
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help='JSON file the results are written to')
+    parser.add_argument('--compare', help='earlier result file to compare against')
+    parser.add_argument('--quick', action='store_true',
+                        help='smaller inputs and fewer iterations, for a smoke run')
+    parser.add_argument('--ingest-sizes', type=int, nargs='+',
+                        help='corpus sizes in quotes, e.g. 1000 1000000')
+    args = parser.parse_args()
+    unknown = [section for section in args.sections if section not in SECTIONS]
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(unknown)}")
+
+    options = dict(QUICK if args.quick else FULL)
+    if args.ingest_sizes:
+        options['ingest_sizes'] = args.ingest_sizes
+    sections = args.sections or list(SECTIONS)
+
+    results = {'environment': environment(), 'options': options}
+    with tempfile.TemporaryDirectory(prefix='meme-bench-') as workdir:
+        for section in sections:
+            results[section] = SECTIONS[section](workdir, options)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(json.load(f), results)
+
+
+if __name__ == '__main__':
+    main()
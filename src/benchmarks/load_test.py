@@ -0,0 +1,178 @@
+"""
+Load test comparing the Flask app with the asynchronous ASGI app.
+
+Start both servers from the src directory (gunicorn and uvicorn are in
+requirements.txt), for example
+
+    gunicorn -w 4 --threads 8 -b :5000 app:app
+    uvicorn app_async:app --workers 4 --port 8000
+
+and run
+
+    python -m benchmarks.load_test --sync-url http://localhost:5000 \\
+        --async-url http://localhost:8000 --concurrency 200 --duration 20
+
+Two scenarios are measured against each target:
+
+* `random`: GET / at the given concurrency. Mostly render-bound, so
+  both apps should be limited by the render workers.
+* `create`: POST /create with an image URL served by a built-in image
+  server that answers after `--image-delay` seconds. Every request uses
+  a distinct URL, so the remote image cache never hits and each request
+  waits on the slow host. This is where the async app should keep far
+  more requests in flight than the thread-per-request server.
+
+For each run, throughput, p50/p95/p99 latency and a count per status code
+are printed; the README lists a measured comparison. Use `--in-process`
+to drive `app_async` without a server (through httpx's ASGI transport). That checks the app end to end but is not a fair
+performance comparison.
+"""
+
+import argparse
+import asyncio
+import http.server
+import io
+import itertools
+import threading
+import time
+from collections import Counter
+
+import httpx
+from PIL import Image
+
+
+def percentile(values, fraction):
+    """ The value at `fraction` (0-1) of the sorted values, or 0 """
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def start_image_server(delay, size=(800, 600)):
+    """ Serve one JPEG for any path after `delay` seconds; returns (server, base URL)
+
+    Paths under /cached/ may be cached for an hour; everything else is sent
+    with no-store, so each request downloads and decodes the image again.
+    """
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (90, 140, 200)).save(buffer, 'JPEG', quality=85)
+    body = buffer.getvalue()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/jpeg')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'max-age=3600' if self.path.startswith('/cached/')
+                             else 'no-store')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+async def run_load(client, scenario, concurrency, duration, requests, image_base):
+    """ Issue requests from `concurrency` tasks; returns (latencies, status counts, seconds) """
+    latencies = []
+    statuses = Counter()
+    counter = itertools.count()
+    deadline = time.monotonic() + duration
+
+    async def one(index):
+        if scenario == 'random':
+            return await client.get('/')
+        return await client.post('/create', data={
+            'image_url': f"{image_base}/dog.jpg?n={index}-{time.time_ns()}",
+            'body': f"Load test {index}",
+            'author': 'Bench',
+        })
+
+    async def worker():
+        while True:
+            index = next(counter)
+            if requests is not None and index >= requests:
+                return
+            if requests is None and time.monotonic() >= deadline:
+                return
+            started = time.monotonic()
+            try:
+                response = await one(index)
+                statuses[response.status_code] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.monotonic() - started)
+
+    started = time.monotonic()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, statuses, time.monotonic() - started
+
+
+def report(name, scenario, latencies, statuses, elapsed):
+    """ Print one result line """
+    throughput = len(latencies) / elapsed if elapsed else 0.0
+    status_text = ' '.join(f"{status}:{count}" for status, count in sorted(
+        statuses.items(), key=lambda item: str(item[0])))
+    print(f"{name:<6} {scenario:<7} {len(latencies):>7} {throughput:9.1f}/s "
+          f"{percentile(latencies, 0.5) * 1000:9.1f} {percentile(latencies, 0.95) * 1000:9.1f} "
+          f"{percentile(latencies, 0.99) * 1000:9.1f}  {status_text}")
+
+
+async def main_async(args):
+    targets = []
+    if args.sync_url:
+        targets.append(('sync', {'base_url': args.sync_url}))
+    if args.async_url:
+        targets.append(('async', {'base_url': args.async_url}))
+    if args.in_process:
+        import app_async
+        targets.append(('asgi', {'base_url': 'http://testserver',
+                                 'transport': httpx.ASGITransport(app=app_async.app)}))
+    if not targets:
+        raise SystemExit("Give --sync-url, --async-url or --in-process")
+
+    image_server, image_base = start_image_server(args.image_delay)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    timeout = httpx.Timeout(args.timeout)
+
+    print(f"{'target':<6} {'case':<7} {'requests':>7} {'throughput':>11} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  statuses")
+    try:
+        for name, options in targets:
+            async with httpx.AsyncClient(limits=limits, timeout=timeout, **options) as client:
+                for scenario in args.scenarios:
+                    latencies, statuses, elapsed = await run_load(
+                        client, scenario, args.concurrency, args.duration,
+                        args.requests, image_base)
+                    report(name, scenario, latencies, statuses, elapsed)
+    finally:
+        image_server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the sync and async apps under load")
+    parser.add_argument('--sync-url', help='base URL of the Flask app')
+    parser.add_argument('--async-url', help='base URL of the ASGI app')
+    parser.add_argument('--in-process', action='store_true',
+                        help='also drive app_async in this process, without a server')
+    parser.add_argument('--scenarios', nargs='+', choices=('random', 'create'),
+                        default=['random', 'create'])
+    parser.add_argument('--concurrency', type=int, default=50, help='requests in flight')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per scenario')
+    parser.add_argument('--requests', type=int,
+                        help='requests per scenario; overrides --duration')
+    parser.add_argument('--image-delay', type=float, default=0.5,
+                        help='seconds the image server waits before answering')
+    parser.add_argument('--timeout', type=float, default=60.0, help='client timeout in seconds')
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,21 @@
 import os
+import csv
 import random
 import argparse
+import logging
 
 # @TODO Import your Ingestor and MemeEngine classes
 
 from MemeEngine import MemeEngine
-from QuoteEngine import Ingestor,QuoteModel
+from QuoteEngine import QuoteModel,CorpusCache,MappedQuoteStore,QuoteIndex
 
 
-def generate_meme(path=None, body=None, author=None):
-    """ Generate a meme given an path and a quote """
+def generate_meme(path=None, body=None, author=None, author_filter=None, keyword=None):
+    """ Generate a meme given an path and a quote
+
+    Without a body, a random quote is used, optionally restricted to
+    quotes by `author_filter` and/or containing `keyword`.
+    """
     img_path = None
     quote = None
 
@@ -28,14 +34,13 @@ def generate_meme(path=None, body=None, author=None):
     else:
         # If a path is provided, check if it's a URL
         if path.startswith('http://') or path.startswith('https://'):
+            # Imported here so local paths never load the HTTP stack
+            from MemeEngine.ImageFetcher import ImageFetchError
+            from MemeEngine.RemoteImageCache import RemoteImageCache
             try:
-                response = requests.get(path, stream=True)
-                response.raise_for_status()
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as temp_file:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        temp_file.write(chunk)
-                    img_path = temp_file.name
-            except requests.exceptions.RequestException as e:
+                # Repeat URLs are served from the on-disk remote image cache
+                img_path = RemoteImageCache().get(path)
+            except ImageFetchError as e:
                 raise Exception(f"Error downloading image from URL {path}: {e}")
         else:
             img_path = path # Assume it's a local file path
@@ -46,16 +51,20 @@ def generate_meme(path=None, body=None, author=None):
                        './_data/DogQuotes/DogQuotesDOCX.docx',
                        './_data/DogQuotes/DogQuotesPDF.pdf',
                        './_data/DogQuotes/DogQuotesCSV.csv']
-        quotes = []
-        for f in quote_files:
-            try:
-                quotes.extend(Ingestor.parse(f))
-            except Exception as e:
-                print(f"Warning: Could not parse {f}: {e}")
+        # The compiled corpus is mapped, not parsed, unless a quote file changed
+        quotes = MappedQuoteStore.open_or_build(
+            quote_files, './_data/DogQuotes/quotes.corpus',
+            CorpusCache('./_data/DogQuotes/.quotes_cache.pickle'))
 
         if not quotes:
             raise Exception("No quotes found in ./_data/DogQuotes/. Please add quote files.")
-        quote = random.choice(quotes)
+        if author_filter or keyword:
+            # The index is read from the corpus file, not built here
+            quote = QuoteIndex(quotes).random(author_filter, keyword)
+            if quote is None:
+                raise Exception("No quotes match the given author filter or keyword.")
+        else:
+            quote = quotes.random()
     else:
         if author is None:
             raise Exception('Author Required if Body is Used')
@@ -65,13 +74,35 @@ def generate_meme(path=None, body=None, author=None):
     meme = MemeEngine('./tmp') # Output to a 'tmp' directory
     output_meme_path = meme.make_meme(img_path, quote.body, quote.author)
 
-    # Clean up temporary image file if it was downloaded from a URL
-    if path and (path.startswith('http://') or path.startswith('https://')) and img_path and os.path.exists(img_path):
-        os.remove(img_path)
-
     return output_meme_path
 
 
+def generate_batch(jobs_csv, workers=None):
+    """ Generate memes for every row of a jobs CSV on a process pool
+
+    The CSV needs 'path', 'body' and 'author' columns and may have a
+    'width' column. Returns the number of failed jobs.
+    """
+    jobs = []
+    with open(jobs_csv, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            job = (row['path'], row['body'], row['author'])
+            if row.get('width'):
+                job += (int(row['width']),)
+            jobs.append(job)
+
+    meme = MemeEngine('./tmp')
+    failures = 0
+    for result in meme.make_memes(jobs, workers=workers):
+        if result.error:
+            failures += 1
+            print(f"Job {result.index} failed ({result.job[0]}): {result.error}")
+        else:
+            print(f"Job {result.index}: {result.path}")
+    print(f"Generated {len(jobs) - failures}/{len(jobs)} memes.")
+    return failures
+
+
 if __name__ == "__main__":
     # Ensure necessary directories exist for CLI tool
     os.makedirs('./_data/DogQuotes', exist_ok=True)
@@ -86,11 +117,26 @@ if __name__ == "__main__":
                         help='Quote body to add to the image.')
     parser.add_argument('--author', type=str,
                         help='Quote author to add to the image.')
+    parser.add_argument('--author-filter', type=str,
+                        help='Pick the random quote from this author only.')
+    parser.add_argument('--keyword', type=str,
+                        help='Pick the random quote from quotes containing this word.')
+    parser.add_argument('--batch', type=str,
+                        help='CSV of jobs (path, body, author[, width]) to render in bulk.')
+    parser.add_argument('--workers', type=int,
+                        help='Number of worker processes for --batch. Defaults to the CPU count.')
 
     args = parser.parse_args()
 
+    # Show the quote engine's progress and warnings on the console
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    if args.batch:
+        raise SystemExit(1 if generate_batch(args.batch, args.workers) else 0)
+
     try:
-        meme_output_path = generate_meme(args.path, args.body, args.author)
+        meme_output_path = generate_meme(args.path, args.body, args.author,
+                                         args.author_filter, args.keyword)
         if meme_output_path:
             print(f"Meme generated successfully at: {meme_output_path}")
         else:
@@ -0,0 +1,8 @@
+"""
+Shared test setup: the packages are imported from src, as the app does.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
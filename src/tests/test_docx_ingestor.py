@@ -0,0 +1,83 @@
+import logging
+import zipfile
+
+import pytest
+
+docx = pytest.importorskip('docx')
+
+from QuoteEngine.DOCXIngestor import DOCUMENT_PART, DOCXIngestor
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+# Paragraph contents, each checked against python-docx's paragraph.text
+PARAGRAPHS = [
+    '<w:r><w:t>"Plain" - Rex</w:t></w:r>',
+    '<w:r><w:t xml:space="preserve">Linked </w:t></w:r>'
+    '<w:hyperlink r:id="rId9"><w:r><w:t>text</w:t></w:r></w:hyperlink>'
+    '<w:r><w:t> - Fido</w:t></w:r>',
+    # Tracked changes: python-docx reads neither the insertion nor the deletion
+    '<w:r><w:t xml:space="preserve">Tracked </w:t></w:r>'
+    '<w:ins w:id="1" w:author="a"><w:r><w:t>inserted </w:t></w:r></w:ins>'
+    '<w:del w:id="2" w:author="a"><w:r><w:delText>deleted </w:delText></w:r></w:del>'
+    '<w:r><w:t>- Spot</w:t></w:r>',
+    # Content controls, fields and smart tags are skipped too
+    '<w:sdt><w:sdtContent><w:r><w:t>control </w:t></w:r></w:sdtContent></w:sdt>'
+    '<w:fldSimple w:instr="PAGE"><w:r><w:t>1</w:t></w:r></w:fldSimple>'
+    '<w:smartTag w:uri="u" w:element="e"><w:r><w:t>tag</w:t></w:r></w:smartTag>'
+    '<w:r><w:t>Controls - Max</w:t></w:r>',
+    '<w:r><w:t>Breaks</w:t><w:br/><w:t>line</w:t><w:br w:type="page"/>'
+    '<w:tab/><w:ptab w:relativeTo="margin" w:alignment="left" w:leader="none"/>'
+    '<w:noBreakHyphen/><w:cr/><w:t>- Buddy</w:t></w:r>',
+]
+
+
+def write_docx(path, paragraphs):
+    """ Saves a python-docx document, then swaps in the given paragraphs """
+    document = docx.Document()
+    document.add_paragraph('placeholder')
+    document.save(path)
+
+    with zipfile.ZipFile(path) as archive:
+        parts = {name: archive.read(name) for name in archive.namelist()}
+    body = ''.join(f'<w:p>{content}</w:p>' for content in paragraphs)
+    # A table's paragraphs are not top-level paragraphs
+    body += '<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Cell - Nobody</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+    parts[DOCUMENT_PART] = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{W_NS}" xmlns:r="http://schemas.openxmlformats.org/'
+        f'officeDocument/2006/relationships"><w:body>{body}<w:sectPr/></w:body>'
+        f'</w:document>').encode('utf-8')
+    with zipfile.ZipFile(path, 'w') as archive:
+        for name, data in parts.items():
+            archive.writestr(name, data)
+
+
+def test_paragraph_text_matches_python_docx(tmp_path):
+    path = str(tmp_path / 'quotes.docx')
+    write_docx(path, PARAGRAPHS)
+
+    expected = [paragraph.text for paragraph in docx.Document(path).paragraphs]
+    assert list(DOCXIngestor.iter_paragraphs(path)) == expected
+    assert [(q.body, q.author) for q in DOCXIngestor.parse(path)][:4] == [
+        ('Plain', 'Rex'), ('Linked text', 'Fido'), ('Tracked', 'Spot'), ('Controls', 'Max')]
+
+
+def test_unreadable_documents_fall_back_to_python_docx(tmp_path, caplog):
+    not_a_zip = tmp_path / 'not_a_zip.docx'
+    not_a_zip.write_text('"Body" - Author')
+    malformed = tmp_path / 'malformed.docx'
+    write_docx(str(malformed), PARAGRAPHS)
+    with zipfile.ZipFile(malformed) as archive:
+        parts = {name: archive.read(name) for name in archive.namelist()}
+    # Broken before the first paragraph, so nothing was streamed yet
+    parts[DOCUMENT_PART] = parts[DOCUMENT_PART][:200]
+    with zipfile.ZipFile(malformed, 'w') as archive:
+        for name, data in parts.items():
+            archive.writestr(name, data)
+
+    with caplog.at_level(logging.ERROR, logger='QuoteEngine.DOCXIngestor'):
+        # The fallback reports the file instead of raising
+        assert DOCXIngestor.parse(str(not_a_zip)) == []
+        assert DOCXIngestor.parse(str(malformed)) == []
+    assert 'not_a_zip.docx' in caplog.text
+    assert 'malformed.docx' in caplog.text
@@ -0,0 +1,25 @@
+"""
+Tests for MemeStore's size budget.
+"""
+
+from MemeEngine.MemeStore import MemeStore
+
+
+def test_oldest_entries_are_dropped_over_budget():
+    store = MemeStore(max_bytes=10)
+    store.put('a', b'x' * 6, 'image/png')
+    store.put('b', b'y' * 6, 'image/png')
+    assert 'a' not in store
+    assert store.get('b') == (b'y' * 6, 'image/png')
+
+
+def test_entry_larger_than_budget_is_kept_until_replaced():
+    store = MemeStore(max_bytes=10)
+    store.put('a', b'x' * 4, 'image/png')
+    store.put('big', b'z' * 64, 'image/png')
+    assert store.get('big') == (b'z' * 64, 'image/png')
+    assert len(store) == 1
+
+    store.put('c', b'c' * 4, 'image/png')
+    assert 'big' not in store
+    assert store.current_bytes == 4
@@ -0,0 +1,52 @@
+"""
+Tests for PdftotextPool with a stand-in pdftotext script on PATH.
+"""
+
+import os
+import subprocess
+
+import pytest
+
+from QuoteEngine.PdftotextPool import PdftotextPool
+
+# Prints two lines, one of them not valid UTF-8; fails for files named bad*
+FAKE_PDFTOTEXT = """#!/bin/sh
+case "$(basename "$2")" in
+  bad*) echo "Syntax Error: broken file" >&2; exit 1 ;;
+esac
+printf '"Woof" - Rex\\n\\377 - Fido'
+"""
+
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    script = tmp_path / 'bin' / 'pdftotext'
+    script.parent.mkdir()
+    script.write_text(FAKE_PDFTOTEXT)
+    script.chmod(0o755)
+    monkeypatch.setenv('PATH', f"{script.parent}{os.pathsep}{os.environ['PATH']}")
+    pool = PdftotextPool(size=2)
+    yield pool
+    pool.close()
+
+
+def test_lines_are_decoded_with_replacement(pool, tmp_path):
+    lines = list(pool.iter_lines(str(tmp_path / 'quotes.pdf')))
+    assert [line.rstrip('\n') for line in lines if line.strip()] == ['"Woof" - Rex', '� - Fido']
+
+
+def test_failure_reports_stderr_and_keeps_worker(pool, tmp_path):
+    with pytest.raises(subprocess.CalledProcessError) as error:
+        list(pool.iter_lines(str(tmp_path / 'bad.pdf')))
+    assert 'broken file' in error.value.stderr
+    # The same shell serves the next file
+    assert len(list(pool.iter_lines(str(tmp_path / 'quotes.pdf')))) > 0
+    assert pool._started == 1
+
+
+def test_worker_abandoned_mid_file_is_replaced(pool, tmp_path):
+    lines = pool.iter_lines(str(tmp_path / 'quotes.pdf'))
+    next(lines)
+    lines.close()
+    assert pool._started == 0
+    assert len(list(pool.iter_lines(str(tmp_path / 'quotes.pdf')))) > 0
@@ -0,0 +1,113 @@
+"""
+Tests for ImageFetcher and RemoteImageCache against a local HTTP server.
+"""
+
+import http.server
+import io
+import os
+import threading
+import time
+
+import pytest
+from PIL import Image
+
+from MemeEngine.ImageFetcher import ImageFetcher, ImageFetchError
+from MemeEngine.RemoteImageCache import RemoteImageCache
+
+
+def jpeg_bytes(size=(64, 48)):
+    """ A small JPEG to serve """
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (200, 120, 40)).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def image_server():
+    """
+    Serve test images from a thread; yields (base URL, list of request paths).
+
+    /big      a body larger than the fetcher's cap
+    /slow     headers at once, the body after one second
+    /etag     an image with an ETag; answers 304 when it is sent back
+    /nostore  an image sent with Cache-Control: no-store
+    """
+    body = jpeg_bytes()
+    requests_seen = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append((self.path, self.headers.get('If-None-Match')))
+            if self.path == '/etag' and self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.send_header('ETag', '"v1"')
+                self.end_headers()
+                return
+
+            data = b'x' * 4096 if self.path == '/big' else body
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/jpeg')
+            self.send_header('Content-Length', str(len(data)))
+            if self.path == '/etag':
+                self.send_header('ETag', '"v1"')
+                self.send_header('Cache-Control', 'max-age=0')
+            elif self.path == '/nostore':
+                self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            if self.path == '/slow':
+                time.sleep(1)
+            try:
+                self.wfile.write(data)
+            except OSError:
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", requests_seen
+    server.shutdown()
+    server.server_close()
+
+
+def test_oversized_body_is_rejected(image_server):
+    base, _ = image_server
+    with pytest.raises(ImageFetchError, match='limit'):
+        ImageFetcher(max_bytes=1024).fetch(f"{base}/big")
+
+
+def test_slow_read_times_out(image_server):
+    base, _ = image_server
+    fetcher = ImageFetcher(read_timeout=0.2)
+    started = time.monotonic()
+    with pytest.raises(ImageFetchError):
+        fetcher.fetch(f"{base}/slow")
+    assert time.monotonic() - started < 1
+
+
+def test_etag_is_revalidated_with_304(image_server, tmp_path):
+    base, requests_seen = image_server
+    cache = RemoteImageCache(cache_dir=str(tmp_path))
+
+    first = cache.get(f"{base}/etag", width=32)
+    # max-age=0, so the second get revalidates instead of downloading again
+    second = cache.get(f"{base}/etag", width=32)
+
+    assert requests_seen == [('/etag', None), ('/etag', '"v1"')]
+    assert cache.stats() == {'hits': 0, 'revalidated': 1, 'misses': 1}
+    assert second.size == first.size == (32, 24)
+    assert second.tobytes() == first.tobytes()
+
+
+def test_no_store_response_is_not_cached(image_server, tmp_path):
+    base, requests_seen = image_server
+    cache = RemoteImageCache(cache_dir=str(tmp_path))
+
+    cache.get(f"{base}/nostore")
+    cache.get(f"{base}/nostore")
+
+    assert len(requests_seen) == 2
+    assert cache.stats()['misses'] == 2
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,32 @@
+"""
+Tests for how RenderScheduler reports missed deadlines and render errors.
+"""
+
+import threading
+
+import pytest
+
+from MemeEngine.RenderScheduler import RenderScheduler, SchedulerBusy
+
+
+def test_timeout_raised_by_render_is_not_busy():
+    def render():
+        raise TimeoutError("socket timed out")
+
+    scheduler = RenderScheduler(workers=1, timeout=5)
+    with pytest.raises(TimeoutError, match='socket'):
+        scheduler.run(render)
+    assert scheduler.stats()['failed'] == 1
+
+
+def test_missed_deadline_is_busy():
+    release = threading.Event()
+    scheduler = RenderScheduler(workers=1, timeout=5)
+    blocker = scheduler.submit(release.wait)
+    try:
+        with pytest.raises(SchedulerBusy):
+            scheduler.run(lambda: 1, timeout=0.1)
+    finally:
+        release.set()
+    blocker.result()
+    assert scheduler.run(lambda: 2) == 2